@@ -3,9 +3,11 @@ Flask application setup for WORDIAMO
 Main application with routing and middleware configuration
 """
 
-from flask import Flask, request, jsonify, session, send_from_directory
+from flask import Flask, Response, request, jsonify, session, send_from_directory, stream_with_context
 from flask_cors import CORS
 import os
+import itertools
+import json
 from datetime import timedelta
 import logging
 
@@ -15,13 +17,28 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from auth import (
-    register_user, login_user, logout_user, token_required, 
+    register_user, login_user, logout_user, token_required, token_user_id_required,
     session_required, current_user, verify_token
 )
-from src.main.models import User, Level, Lesson, Question, Option, StudentAttempt
-from quiz import start_quiz, submit_answer, quiz_progress, quiz_history
-from src.main.database import db_manager_instance
+from src.main.models import User, Lesson
+from quiz import (
+    start_quiz, submit_answer, submit_batch, quiz_progress, quiz_history_page,
+    quiz_session_stats, start_session_sweeper
+)
+from src.main.database import (
+    db_manager_instance, init_request_scope, pool_metrics, cache_stats, DatabaseSaturatedError,
+    init_query_budgets, query_budget_stats
+)
+from src.main.database.pool import to_prometheus
 from src.main.content_categorization import ContentCategorization
+from src.main.content_catalog import content_catalog, start_catalog_refresher
+from src.main.content_statistics import content_statistics as current_content_statistics
+
+def server_error(message: str, error: Exception):
+    """500 JSON response for a failed route; a saturated pool goes to the 503 handler instead"""
+    if isinstance(error, DatabaseSaturatedError):
+        raise error
+    return jsonify({'error': f'{message}: {str(error)}'}), 500
 
 def create_app(config=None):
     """Create and configure Flask application"""
@@ -33,10 +50,22 @@ def create_app(config=None):
     app.config['SESSION_PERMANENT'] = False
     app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=24)
     app.config['JSON_SORT_KEYS'] = False
+    app.config['DB_REQUEST_SCOPED_CONNECTION'] = os.getenv('DB_REQUEST_SCOPED_CONNECTION', 'False').lower() == 'true'
     
     if config:
         app.config.update(config)
     
+    # Load the content catalog up front so the first requests don't pay for it
+    app.config.setdefault('CONTENT_CATALOG_PRELOAD',
+                          os.getenv('CONTENT_CATALOG_PRELOAD', 'True').lower() == 'true')
+    
+    # Reuse one pooled connection for every query in a request
+    if app.config['DB_REQUEST_SCOPED_CONNECTION']:
+        init_request_scope(app)
+    
+    # Warn (or fail in testing) when an endpoint exceeds its query budget
+    init_query_budgets(app)
+    
     # Enable CORS
     CORS(app, supports_credentials=True)
     
@@ -44,6 +73,24 @@ def create_app(config=None):
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
     
+    # Expire abandoned quiz sessions in the background (0 disables)
+    app.config.setdefault('QUIZ_SESSION_SWEEP_INTERVAL',
+                          float(os.getenv('QUIZ_SESSION_SWEEP_INTERVAL', 60)))
+    if app.config['QUIZ_SESSION_SWEEP_INTERVAL'] > 0:
+        start_session_sweeper(app.config['QUIZ_SESSION_SWEEP_INTERVAL'])
+    
+    if app.config['CONTENT_CATALOG_PRELOAD']:
+        try:
+            content_catalog()
+        except Exception as e:
+            logger.warning(f"Content catalog not preloaded, will load on first use: {e}")
+    
+    # Pick up content edits (and with them new statistics and ETags) without a restart (0 disables)
+    app.config.setdefault('CONTENT_CATALOG_REFRESH_INTERVAL',
+                          float(os.getenv('CONTENT_CATALOG_REFRESH_INTERVAL', 60)))
+    if app.config['CONTENT_CATALOG_REFRESH_INTERVAL'] > 0:
+        start_catalog_refresher(app.config['CONTENT_CATALOG_REFRESH_INTERVAL'])
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -57,6 +104,13 @@ def create_app(config=None):
     def bad_request(error):
         return jsonify({'error': 'Bad request'}), 400
     
+    @app.errorhandler(DatabaseSaturatedError)
+    def database_saturated(error):
+        logger.warning(f"Shedding {request.method} {request.path}: {error}")
+        response = jsonify({'error': 'Service is busy, please retry shortly'})
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response, 503
+    
     # Middleware
     @app.before_request
     def before_request():
@@ -71,6 +125,12 @@ def create_app(config=None):
         response.headers['X-XSS-Protection'] = '1; mode=block'
         return response
     
+    def versioned(response, version: str):
+        """Tag a response with the content version and answer If-None-Match with 304"""
+        response.set_etag(version)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    
     # Health check endpoint
     @app.route('/health', methods=['GET'])
     def health_check():
@@ -91,6 +151,26 @@ def create_app(config=None):
                 'error': str(e)
             }), 503
     
+    # Metrics endpoint
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Connection pool metrics (JSON, or Prometheus text with ?format=prometheus)"""
+        try:
+            pools = pool_metrics()
+            
+            if request.args.get('format') == 'prometheus':
+                return Response(to_prometheus(pools), mimetype='text/plain; version=0.0.4')
+            
+            return jsonify({
+                'success': True,
+                'database_pools': pools,
+                'query_cache': cache_stats(),
+                'queries_by_endpoint': query_budget_stats(),
+                'quiz_sessions': quiz_session_stats()
+            }), 200
+        except Exception as e:
+            return server_error('Failed to fetch metrics', e)
+    
     # Authentication endpoints
     @app.route('/auth/register', methods=['POST'])
     def auth_register():
@@ -112,7 +192,7 @@ def create_app(config=None):
                 return jsonify(result), 400
                 
         except Exception as e:
-            return jsonify({'error': f'Registration failed: {str(e)}'}), 500
+            return server_error('Registration failed', e)
     
     @app.route('/auth/login', methods=['POST'])
     def auth_login():
@@ -136,7 +216,7 @@ def create_app(config=None):
                 return jsonify(result), 401
                 
         except Exception as e:
-            return jsonify({'error': f'Login failed: {str(e)}'}), 500
+            return server_error('Login failed', e)
     
     @app.route('/auth/logout', methods=['POST'])
     def auth_logout():
@@ -158,18 +238,18 @@ def create_app(config=None):
             return jsonify({'success': True, 'message': 'Logout successful'}), 200
             
         except Exception as e:
-            return jsonify({'error': f'Logout failed: {str(e)}'}), 500
+            return server_error('Logout failed', e)
     
     # Content access endpoints
     @app.route('/levels', methods=['GET'])
     def levels():
         """Get all available learning levels"""
         try:
-            levels = Level.all()
+            catalog = content_catalog()
             levels_data = []
             
-            for level in levels:
-                lesson_count = level.lesson_count()
+            for level in catalog.levels:
+                lesson_count = catalog.lesson_count(level.level_id)
                 levels_data.append({
                     'level_id': level.level_id,
                     'level_name': level.level_name,
@@ -184,17 +264,18 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch levels: {str(e)}'}), 500
+            return server_error('Failed to fetch levels', e)
     
     @app.route('/levels/<int:level_id>', methods=['GET'])
     def level_by_id(level_id):
         """Get single level information"""
         try:
-            level = Level.by_id(level_id)
+            catalog = content_catalog()
+            level = catalog.level(level_id)
             if not level:
                 return jsonify({'error': 'Level not found'}), 404
             
-            lesson_count = level.lesson_count()
+            lesson_count = catalog.lesson_count(level_id)
             
             return jsonify({
                 'success': True,
@@ -208,22 +289,26 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch level: {str(e)}'}), 500
+            return server_error('Failed to fetch level', e)
     
     @app.route('/levels/<int:level_id>/lessons', methods=['GET'])
     def lessons_by_level(level_id):
         """Get lessons for a specific level"""
         try:
-            level = Level.by_id(level_id)
+            catalog = content_catalog()
+            level = catalog.level(level_id)
             if not level:
                 return jsonify({'error': 'Level not found'}), 404
             
-            lessons = Lesson.by_level(level_id)
+            lessons = catalog.lessons_for_level(level_id)
             lessons_data = []
             
+            # Attempt aggregates for every lesson of the level in one query
+            stats = Lesson.stats_for([lesson.lesson_id for lesson in lessons])
+            
             for lesson in lessons:
-                question_count = lesson.question_count()
-                avg_score = lesson.average_score()
+                question_count = catalog.question_count(lesson.lesson_id)
+                avg_score = stats.get(lesson.lesson_id, {}).get('average_score', 0.0)
                 
                 lessons_data.append({
                     'lesson_id': lesson.lesson_id,
@@ -246,14 +331,15 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch lessons: {str(e)}'}), 500
+            return server_error('Failed to fetch lessons', e)
     
     @app.route('/lessons/<int:lesson_id>/questions', methods=['GET'])
     @token_required
     def questions_by_lesson(current_user, lesson_id):
         """Get questions for a specific lesson (requires authentication)"""
         try:
-            lesson = Lesson.by_id(lesson_id)
+            catalog = content_catalog()
+            lesson = catalog.lesson(lesson_id)
             if not lesson:
                 return jsonify({'error': 'Lesson not found'}), 404
             
@@ -261,11 +347,10 @@ def create_app(config=None):
             if lesson.level_id > current_user.current_level_id:
                 return jsonify({'error': 'Access denied to this lesson'}), 403
             
-            questions = Question.by_lesson(lesson_id)
             questions_data = []
             
-            for question in questions:
-                options = Option.by_question(question.question_id)
+            for question in catalog.questions_for_lesson(lesson_id):
+                options = catalog.options_for(question.question_id)
                 options_data = [
                     {
                         'option_id': option.option_id,
@@ -294,7 +379,7 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch questions: {str(e)}'}), 500
+            return server_error('Failed to fetch questions', e)
     
     # Quiz functionality endpoints
     @app.route('/quiz/start', methods=['POST'])
@@ -327,7 +412,7 @@ def create_app(config=None):
                 
         except Exception as e:
             logger.error(f"Exception in quiz_start: {str(e)}")
-            return jsonify({'error': f'Failed to start quiz: {str(e)}'}), 500
+            return server_error('Failed to start quiz', e)
     
     @app.route('/quiz/check-answer', methods=['POST'])
     @token_required
@@ -345,12 +430,13 @@ def create_app(config=None):
                 return jsonify({'error': 'Question ID and Option ID required'}), 400
             
             # Get the question
-            question = Question.by_id(question_id)
+            catalog = content_catalog()
+            question = catalog.question(question_id)
             if not question:
                 return jsonify({'error': 'Question not found'}), 404
             
             # Get all options for this question
-            options = Option.by_question(question_id)
+            options = catalog.options_for(question_id)
             
             # Find correct option
             correct_option = None
@@ -374,12 +460,12 @@ def create_app(config=None):
             }), 200
                 
         except Exception as e:
-            return jsonify({'error': f'Failed to check answer: {str(e)}'}), 500
+            return server_error('Failed to check answer', e)
 
     @app.route('/quiz/submit', methods=['POST'])
-    @token_required
-    def quiz_submit(current_user):
-        """Submit quiz answer"""
+    @token_user_id_required
+    def quiz_submit(user_id):
+        """Submit quiz answer (answered from the quiz session; no user lookup)"""
         try:
             data = request.get_json()
             if not data:
@@ -391,7 +477,42 @@ def create_app(config=None):
             if not question_id or not option_id:
                 return jsonify({'error': 'Question ID and Option ID required'}), 400
             
-            result = submit_answer(current_user.user_id, question_id, option_id)
+            try:
+                question_id, option_id = int(question_id), int(option_id)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Question ID and Option ID must be integers'}), 400
+            
+            result = submit_answer(user_id, question_id, option_id)
+            
+            if result['success']:
+                return jsonify(result), 200
+            else:
+                return jsonify(result), 400
+                
+        except Exception as e:
+            return server_error('Failed to submit answer', e)
+    
+    @app.route('/quiz/submit-batch', methods=['POST'])
+    @token_required
+    def quiz_submit_batch(current_user):
+        """Submit all answers of a quiz at once
+        
+        Body: {"answers": [{"question_id", "option_id"}, ...]} for the active
+        session, plus "lesson_id" to take a quiz without /quiz/start.
+        """
+        try:
+            data = request.get_json()
+            if not data or not isinstance(data.get('answers'), list) or not data['answers']:
+                return jsonify({'error': 'A non-empty answers list is required'}), 400
+            
+            lesson_id = data.get('lesson_id')
+            if lesson_id is not None:
+                try:
+                    lesson_id = int(lesson_id)
+                except (TypeError, ValueError):
+                    return jsonify({'error': 'Lesson ID must be an integer'}), 400
+            
+            result = submit_batch(current_user.user_id, data['answers'], lesson_id)
             
             if result['success']:
                 return jsonify(result), 200
@@ -399,31 +520,19 @@ def create_app(config=None):
                 return jsonify(result), 400
                 
         except Exception as e:
-            return jsonify({'error': f'Failed to submit answer: {str(e)}'}), 500
+            return server_error('Failed to submit answers', e)
     
     @app.route('/user/progress', methods=['GET'])
     @token_required
     def user_progress(current_user):
         """Get user's current progress"""
         try:
-            # Get user progress data
-            progress_data = current_user.progress()
+            # Progress, completed lessons, per-level completion and upgrade check
+            snapshot = current_user.progress_snapshot()
             
             # Get current quiz progress if any
             active_quiz = quiz_progress(current_user.user_id)
             
-            # Get completed lessons
-            completed_lessons = current_user.completed_lessons()
-            
-            # Get level completion progress for all levels
-            levels = Level.all()
-            level_progress = {}
-            for level in levels:
-                level_progress[level.level_id] = current_user.level_completion_progress(level.level_id)
-            
-            # Check for level upgrade possibility
-            upgrade_check = current_user.check_level_upgrade()
-            
             return jsonify({
                 'success': True,
                 'user': {
@@ -431,31 +540,38 @@ def create_app(config=None):
                     'username': current_user.username,
                     'current_level_id': current_user.current_level_id
                 },
-                'progress': progress_data,
-                'completed_lessons': completed_lessons,
-                'level_progress': level_progress,
-                'level_upgrade': upgrade_check,
+                'progress': snapshot['progress'],
+                'completed_lessons': snapshot['completed_lessons'],
+                'level_progress': snapshot['level_progress'],
+                'level_upgrade': snapshot['level_upgrade'],
                 'active_quiz': active_quiz if active_quiz.get('success') else None
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch progress: {str(e)}'}), 500
+            return server_error('Failed to fetch progress', e)
     
     @app.route('/user/scores', methods=['GET'])
     @token_required
     def user_scores(current_user):
         """Get user's quiz score history"""
         try:
-            limit = request.args.get('limit', 10, type=int)
-            history = quiz_history(current_user.user_id, limit)
+            limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+            cursor = request.args.get('cursor')
+            
+            try:
+                page = quiz_history_page(current_user.user_id, limit, cursor)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
             
             return jsonify({
                 'success': True,
-                'quiz_history': history
+                'quiz_history': page['quiz_history'],
+                'next_cursor': page['next_cursor'],
+                'has_more': page['has_more']
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch scores: {str(e)}'}), 500
+            return server_error('Failed to fetch scores', e)
     
     @app.route('/user/profile', methods=['GET'])
     @token_required
@@ -463,8 +579,7 @@ def create_app(config=None):
         """Get user profile information"""
         try:
             # Get current level name
-            from src.main.models.models import Level
-            current_level = Level.by_id(current_user.current_level_id)
+            current_level = content_catalog().level(current_user.current_level_id)
             
             return jsonify({
                 'success': True,
@@ -480,7 +595,7 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch profile: {str(e)}'}), 500
+            return server_error('Failed to fetch profile', e)
     
     @app.route('/user/profile', methods=['PUT'])
     @token_required
@@ -520,7 +635,7 @@ def create_app(config=None):
                 }), 200
                 
         except Exception as e:
-            return jsonify({'error': f'Failed to update profile: {str(e)}'}), 500
+            return server_error('Failed to update profile', e)
     
     @app.route('/user/change-password', methods=['POST'])
     @token_required
@@ -543,11 +658,7 @@ def create_app(config=None):
             new_password_hash = hashpw(data['new_password'].encode('utf-8'), gensalt()).decode('utf-8')
             
             # Update password in database
-            from src.main.database.database import update as db_update
-            sql = "UPDATE users SET password_hash = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s"
-            affected = db_update(sql, (new_password_hash, current_user.user_id))
-            
-            if affected > 0:
+            if current_user.change_password(new_password_hash):
                 return jsonify({
                     'success': True,
                     'message': 'Password changed successfully'
@@ -556,7 +667,7 @@ def create_app(config=None):
                 return jsonify({'error': 'Failed to update password'}), 500
                 
         except Exception as e:
-            return jsonify({'error': f'Failed to change password: {str(e)}'}), 500
+            return server_error('Failed to change password', e)
     
     @app.route('/user/account', methods=['DELETE'])
     @token_required
@@ -589,19 +700,20 @@ def create_app(config=None):
                 return jsonify({'error': 'Failed to delete account'}), 500
                 
         except Exception as e:
-            return jsonify({'error': f'Failed to delete account: {str(e)}'}), 500
+            return server_error('Failed to delete account', e)
     
     @app.route('/lesson/access-check/<int:lesson_id>', methods=['GET'])
     @token_required
     def check_lesson_access(current_user, lesson_id):
         """Check if user can access a specific lesson"""
         try:
-            lesson = Lesson.by_id(lesson_id)
+            catalog = content_catalog()
+            lesson = catalog.lesson(lesson_id)
             if not lesson:
                 return jsonify({'error': 'Lesson not found'}), 404
             
-            level = Level.by_id(lesson.level_id)
-            user_level = Level.by_id(current_user.current_level_id)
+            level = catalog.level(lesson.level_id)
+            user_level = catalog.level(current_user.current_level_id)
             
             # Check if user can access this lesson level
             can_access = lesson.level_id <= current_user.current_level_id
@@ -641,7 +753,7 @@ def create_app(config=None):
             return jsonify(response), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to check lesson access: {str(e)}'}), 500
+            return server_error('Failed to check lesson access', e)
     
     # Content Categorization endpoints
     @app.route('/content/categories', methods=['GET'])
@@ -654,30 +766,51 @@ def create_app(config=None):
                 'categories': categories
             }), 200
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch categories: {str(e)}'}), 500
+            return server_error('Failed to fetch categories', e)
     
     @app.route('/content/overview', methods=['GET'])
     def content_overview():
         """Get overview of all content by categories"""
         try:
             overview = ContentCategorization.content_overview()
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'overview': overview
-            }), 200
+            })
+            return versioned(response, current_content_statistics().version)
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch content overview: {str(e)}'}), 500
+            return server_error('Failed to fetch content overview', e)
     
     @app.route('/questions/by-type/<string:question_type>', methods=['GET'])
     def questions_by_type(question_type):
-        """Get questions by skill type"""
+        """Get questions by skill type
+        
+        Filters: ?level_id, ?difficulty. Paging: ?limit with ?page or ?cursor
+        (the next_cursor of the previous page). ?format=jsonl streams one
+        question per line instead, unbounded unless ?limit is given.
+        """
         try:
-            questions = Question.by_type(question_type)
-            questions_data = []
-            
-            for question in questions:
-                options = question.options()
-                questions_data.append({
+            limit = request.args.get('limit', type=int)
+            page = max(request.args.get('page', 1, type=int), 1)
+            cursor = request.args.get('cursor')
+            level_id = request.args.get('level_id', type=int)
+            difficulty = request.args.get('difficulty')
+            
+            if difficulty and difficulty not in ('easy', 'medium', 'hard'):
+                return jsonify({'error': 'difficulty must be easy, medium or hard'}), 400
+            
+            catalog = content_catalog()
+            try:
+                after = int(cursor) if cursor else None
+                matches = catalog.find_questions(question_type, level_id, difficulty, after)
+                # Surface a bad cursor now rather than halfway through a response
+                first = next(matches, None)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            matches = itertools.chain([first] if first else [], matches)
+            
+            def question_payload(question):
+                return {
                     'question_id': question.question_id,
                     'question_text': question.question_text,
                     'lesson_id': question.lesson_id,
@@ -690,19 +823,39 @@ def create_app(config=None):
                             'is_correct': option.is_correct,
                             'option_order': option.option_order
                         }
-                        for option in sorted(options, key=lambda x: x.option_order)
+                        for option in catalog.options_for(question.question_id)
                     ]
-                })
+                }
+            
+            if request.args.get('format') == 'jsonl':
+                if limit:
+                    matches = itertools.islice(matches, max(limit, 1))
+                
+                def generate():
+                    for question in matches:
+                        yield json.dumps(question_payload(question), default=str) + '\n'
+                
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+            
+            limit = min(max(limit or 50, 1), 500)
+            offset = 0 if cursor else (page - 1) * limit
+            page_questions = list(itertools.islice(matches, offset, offset + limit + 1))
+            has_more = len(page_questions) > limit
+            page_questions = page_questions[:limit]
             
             return jsonify({
                 'success': True,
                 'question_type': question_type,
-                'questions': questions_data,
-                'total_count': len(questions_data)
+                'questions': [question_payload(question) for question in page_questions],
+                'total_count': sum(1 for _ in catalog.find_questions(question_type, level_id, difficulty)),
+                'limit': limit,
+                'page': None if cursor else page,
+                'next_cursor': str(page_questions[-1].question_id) if has_more else None,
+                'has_more': has_more
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch questions by type: {str(e)}'}), 500
+            return server_error('Failed to fetch questions by type', e)
     
     @app.route('/lessons/by-skill/<string:skill_type>', methods=['GET'])
     def lessons_by_skill(skill_type):
@@ -720,7 +873,7 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch lessons by skill: {str(e)}'}), 500
+            return server_error('Failed to fetch lessons by skill', e)
     
     @app.route('/user/progress/by-category', methods=['GET'])
     @token_required
@@ -735,7 +888,7 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch skill analysis: {str(e)}'}), 500
+            return server_error('Failed to fetch skill analysis', e)
     
     @app.route('/levels/<int:level_id>/skills', methods=['GET'])
     def level_skill_distribution(level_id):
@@ -749,26 +902,22 @@ def create_app(config=None):
             }), 200
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch level skill distribution: {str(e)}'}), 500
+            return server_error('Failed to fetch level skill distribution', e)
     
     @app.route('/content/statistics', methods=['GET'])
     def content_statistics():
         """Get question and difficulty statistics"""
         try:
-            question_stats = Question.type_statistics()
-            difficulty_stats = Question.difficulty_statistics()
-            
-            return jsonify({
+            statistics = current_content_statistics()
+            response = jsonify({
                 'success': True,
-                'statistics': {
-                    'question_types': question_stats,
-                    'difficulty_levels': difficulty_stats,
-                    'total_questions': sum(question_stats.values())
-                }
-            }), 200
+                'version': statistics.version,
+                'statistics': statistics.as_dict()
+            })
+            return versioned(response, statistics.version)
             
         except Exception as e:
-            return jsonify({'error': f'Failed to fetch statistics: {str(e)}'}), 500
+            return server_error('Failed to fetch statistics', e)
     
     # Static file serving routes
     @app.route('/')
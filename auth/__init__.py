@@ -3,11 +3,11 @@
 from .auth import (
     hash_password, verify_password, generate_token, verify_token,
     register_user, login_user, logout_user, current_user,
-    token_required, session_required
+    token_required, token_user_id_required, session_required
 )
 
 __all__ = [
     'hash_password', 'verify_password', 'generate_token', 'verify_token',
     'register_user', 'login_user', 'logout_user', 'current_user',
-    'token_required', 'session_required'
+    'token_required', 'token_user_id_required', 'session_required'
 ]
\ No newline at end of file
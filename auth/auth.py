@@ -11,6 +11,7 @@ from typing import Optional, Dict, Any
 from functools import wraps
 from flask import request, jsonify, session
 from src.main.models import User
+from src.main.database import DatabaseSaturatedError
 
 # Configuration
 SECRET_KEY = os.getenv('SECRET_KEY', 'wordiamo_secret_key_2024')
@@ -84,6 +85,8 @@ def register_user(username: str, email: str, password: str) -> Dict[str, Any]:
             },
             'token': token
         }
+    except DatabaseSaturatedError:
+        raise
     except Exception as e:
         return {'success': False, 'message': f'Registration failed: {str(e)}'}
 
@@ -117,6 +120,8 @@ def login_user(identifier: str, password: str) -> Dict[str, Any]:
             },
             'token': token
         }
+    except DatabaseSaturatedError:
+        raise
     except Exception as e:
         return {'success': False, 'message': f'Login failed: {str(e)}'}
 
@@ -129,6 +134,8 @@ def logout_user(token: str) -> Dict[str, Any]:
             return {'success': True, 'message': 'Logout successful'}
         else:
             return {'success': False, 'message': 'Invalid token'}
+    except DatabaseSaturatedError:
+        raise
     except Exception as e:
         return {'success': False, 'message': f'Logout failed: {str(e)}'}
 
@@ -139,27 +146,35 @@ def current_user(token: str) -> Optional[User]:
         return User.by_id(payload['user_id'])
     return None
 
+def _request_token_payload():
+    """Get the verified JWT payload of the current request, or (None, error response)"""
+    token = None
+    
+    # Get token from header
+    if 'Authorization' in request.headers:
+        auth_header = request.headers['Authorization']
+        try:
+            token = auth_header.split(" ")[1]  # Bearer <token>
+        except IndexError:
+            return None, (jsonify({'message': 'Invalid token format'}), 401)
+    
+    if not token:
+        return None, (jsonify({'message': 'Token is missing'}), 401)
+    
+    # Verify token
+    payload = verify_token(token)
+    if not payload:
+        return None, (jsonify({'message': 'Token is invalid or expired'}), 401)
+    
+    return payload, None
+
 def token_required(f):
     """Decorator to require valid token for API endpoints"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        # Get token from header
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                token = auth_header.split(" ")[1]  # Bearer <token>
-            except IndexError:
-                return jsonify({'message': 'Invalid token format'}), 401
-        
-        if not token:
-            return jsonify({'message': 'Token is missing'}), 401
-        
-        # Verify token
-        payload = verify_token(token)
-        if not payload:
-            return jsonify({'message': 'Token is invalid or expired'}), 401
+        payload, error = _request_token_payload()
+        if error:
+            return error
         
         # Get current user
         current_user = User.by_id(payload['user_id'])
@@ -170,6 +185,21 @@ def token_required(f):
     
     return decorated
 
+def token_user_id_required(f):
+    """Decorator like token_required that passes only the token's user ID
+    
+    Skips loading the user, for hot endpoints whose own state (such as an
+    active quiz session) already proves the user exists.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        payload, error = _request_token_payload()
+        if error:
+            return error
+        return f(payload['user_id'], *args, **kwargs)
+    
+    return decorated
+
 def session_required(f):
     """Decorator to require valid session for web interface"""
     @wraps(f)
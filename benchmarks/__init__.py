@@ -0,0 +1 @@
+"""WORDIAMO benchmarks - run each script from the project root"""
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+complete_quiz latency benchmark for WORDIAMO
+Compares scoring through Question.validate_answer (one query per question
+in calculate_score and again in detailed_results) with the session's
+in-memory answer key
+
+MySQL is replaced by a stub that sleeps DB_LATENCY_MS per statement, so the
+numbers show round trips saved rather than real server time. The attempt,
+answer and progress writes are stubbed out identically in both modes.
+Run from the project root: python benchmarks/bench_complete_quiz.py
+"""
+
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz.quiz as quiz_module
+from quiz.quiz import QuizSession, complete_quiz
+from src.main.models import models
+from benchmarks.common import make_catalog, quiz_stubs, QUESTIONS_PER_LESSON
+
+DB_LATENCY_MS = 0.5
+RUNS = 200
+
+class StubDatabase:
+    """Answers validate_answer's query from the catalog after a fixed delay"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.statements = 0
+
+    def query(self, sql, params=None, **kwargs):
+        self.statements += 1
+        time.sleep(DB_LATENCY_MS / 1000)
+        option_id, question_id = params
+        option = next((o for o in self.catalog.options_for(question_id) if o.option_id == option_id), None)
+        return [{'is_correct': option.is_correct}] if option else []
+
+def legacy_calculate_score(session):
+    """calculate_score as it was: one validate_answer query per question"""
+    correct = sum(1 for item in session.questions
+                  if item['question'].question_id in session.answers
+                  and item['question'].validate_answer(session.answers[item['question'].question_id]))
+    total = len(session.questions)
+    return int(correct / total * 100) if total else 0, correct, total
+
+def legacy_detailed_results(session):
+    """detailed_results as it was: validate_answer again for every question"""
+    return [{'question_id': item['question'].question_id,
+             'is_correct': item['question'].validate_answer(session.answers.get(item['question'].question_id))}
+            for item in session.questions]
+
+def answered_session(catalog):
+    """A finished session with every other answer correct"""
+    session = QuizSession(1, 1)
+    for i, item in enumerate(session.questions):
+        options = item['options']
+        session.answers[item['question'].question_id] = options[0 if i % 2 else 1].option_id
+    return session
+
+def run(catalog, legacy: bool):
+    """Return (mean ms, p99 ms, statements per call) for complete_quiz"""
+    db = StubDatabase(catalog)
+    with quiz_stubs(catalog) as stack:
+        stack.enter_context(mock.patch.object(models, 'query', db.query))
+        if legacy:
+            stack.enter_context(mock.patch.object(QuizSession, 'calculate_score', legacy_calculate_score))
+            stack.enter_context(mock.patch.object(quiz_module, 'detailed_results', legacy_detailed_results))
+        timings = []
+        for _ in range(RUNS):
+            session = answered_session(catalog)
+            # complete_quiz claims the stored session before writing
+            quiz_module.session_store.create(session.user_id, session.to_state())
+            started = time.perf_counter()
+            result = complete_quiz(1, session)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert result['success']
+    timings.sort()
+    return sum(timings) / len(timings), timings[int(len(timings) * 0.99) - 1], db.statements / RUNS
+
+def main():
+    catalog = make_catalog(lessons=1)
+    print(f"{QUESTIONS_PER_LESSON} questions, {DB_LATENCY_MS} ms per statement")
+    print(f"{'mode':>12} {'mean ms':>10} {'p99 ms':>10} {'queries':>8}")
+    for name, legacy in (('validate', True), ('answer key', False)):
+        mean, p99, statements = run(catalog, legacy)
+        print(f"{name:>12} {mean:>10.2f} {p99:>10.2f} {statements:>8.0f}")
+
+if __name__ == '__main__':
+    main()
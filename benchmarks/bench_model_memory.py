@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Model memory benchmark for WORDIAMO
+Reports bytes per model instance and per active quiz session, comparing
+plain __dict__-backed classes (the old layout) with the slotted models and
+catalog-shared quiz entries
+
+Run from the project root: python benchmarks/bench_model_memory.py
+"""
+
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main.models.models import User, Level, Lesson, Question, Option, StudentAttempt
+from src.main.content_catalog import ContentCatalog
+from benchmarks.common import make_catalog, QUESTIONS_PER_LESSON, OPTIONS_PER_QUESTION
+
+INSTANCES = 10_000
+SESSIONS = 1_000
+
+def unslotted(cls):
+    """Plain class with the same constructor, as the models were before __slots__"""
+    return type(f"Plain{cls.__name__}", (), {'__init__': cls.__init__, '_fields': cls._fields})
+
+def sample_args(cls, i: int):
+    """Constructor arguments shaped like a row of cls's table"""
+    now = datetime.now()
+    return {
+        User: (i, f"user{i}", f"user{i}@example.com", 'x' * 60, 1, now, now),
+        Level: (i, f"Level {i}", 'Description', i, now),
+        Lesson: (i, f"Lesson {i}", 'Description', 1, i, 15, now),
+        Question: (i, f"Question text {i}", 1, 'vocabulary', 'easy', now),
+        Option: (i, i // 4, f"Option {i}", i % 4 == 0, i % 4 + 1),
+        StudentAttempt: (i, 1, 1, 80, 10, 8, now, 12, True),
+    }[cls]
+
+def measure(build):
+    """Return the bytes still allocated by whatever build() returns"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+def old_session(catalog: ContentCatalog, lesson_id: int):
+    """Per-session question list as QuizSession built it before: fresh models and dicts"""
+    PlainQuestion, PlainOption = unslotted(Question), unslotted(Option)
+    questions = []
+    for q in catalog.questions_for_lesson(lesson_id):
+        questions.append({
+            'question': PlainQuestion(q.question_id, q.question_text, q.lesson_id,
+                                      q.question_type, q.difficulty_level, q.created_at),
+            'options': [PlainOption(o.option_id, o.question_id, o.option_text, o.is_correct, o.option_order)
+                        for o in catalog.options_for(q.question_id)]
+        })
+    return {'answers': {}, 'questions': questions}
+
+def new_session(catalog: ContentCatalog, lesson_id: int):
+    """Per-session question state now: a reference to the catalog's shared entries"""
+    return {'answers': {}, 'questions': catalog.quiz_items(lesson_id)}
+
+def main():
+    print(f"{'model':>16} {'before B':>10} {'after B':>10}")
+    for cls in (User, Level, Lesson, Question, Option, StudentAttempt):
+        plain = unslotted(cls)
+        args = [sample_args(cls, i) for i in range(INSTANCES)]
+        before = measure(lambda: [plain(*a) for a in args]) / INSTANCES
+        after = measure(lambda: [cls(*a) for a in args]) / INSTANCES
+        print(f"{cls.__name__:>16} {before:>10.0f} {after:>10.0f}")
+
+    catalog = make_catalog(lessons=50)
+    lesson_ids = [i % 50 + 1 for i in range(SESSIONS)]
+    before = measure(lambda: [old_session(catalog, l) for l in lesson_ids]) / SESSIONS
+    after = measure(lambda: [new_session(catalog, l) for l in lesson_ids]) / SESSIONS
+    print(f"\n{'quiz session':>16} {before:>10.0f} {after:>10.0f}"
+          f"   ({QUESTIONS_PER_LESSON} questions x {OPTIONS_PER_QUESTION} options)")
+
+if __name__ == '__main__':
+    main()
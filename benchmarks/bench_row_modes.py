@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Row mode micro-benchmark for WORDIAMO
+Compares building models from dict rows (cls(**row)) against positional
+tuples mapped by model_rows, for 10k and 100k student_attempts rows
+
+Both modes start from the tuples the MySQL protocol layer produces; dict mode
+then pays for the dict the dictionary cursor builds per row, as it does in
+execute_query. Run from the project root: python benchmarks/bench_row_modes.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main.models.models import StudentAttempt, model_rows
+
+COLUMNS = ('attempt_id', 'user_id', 'lesson_id', 'score', 'total_questions',
+           'correct_answers', 'attempt_date', 'completion_time_minutes')
+
+def make_rows(count: int):
+    """Build raw result tuples shaped like SELECT * FROM student_attempts"""
+    now = datetime.now()
+    return [(i, 1, i % 30 + 1, 80, 10, 8, now, 12) for i in range(count)]
+
+def dict_mode(rows):
+    """What the dictionary cursor plus cls(**row) does"""
+    return [StudentAttempt(**dict(zip(COLUMNS, row))) for row in rows]
+
+def tuple_mode(rows):
+    """Positional rows mapped once per statement"""
+    build = model_rows(StudentAttempt)(COLUMNS)
+    return [build(row) for row in rows]
+
+def measure(mode, rows):
+    """Return (seconds, peak bytes) for building all models"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    models = mode(rows)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(models) == len(rows)
+    return elapsed, peak
+
+def main():
+    print(f"{'rows':>8} {'mode':>6} {'ms':>10} {'peak KiB':>10}")
+    for count in (10_000, 100_000):
+        rows = make_rows(count)
+        for name, mode in (('dict', dict_mode), ('tuple', tuple_mode)):
+            best = min(measure(mode, rows) for _ in range(3))
+            print(f"{count:>8} {name:>6} {best[0] * 1000:>10.1f} {best[1] / 1024:>10.0f}")
+
+if __name__ == '__main__':
+    main()
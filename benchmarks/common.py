@@ -0,0 +1,56 @@
+"""
+Shared setup for the WORDIAMO benchmarks
+A synthetic content catalog and the stubs the quiz benchmarks run under
+instead of MySQL
+"""
+
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Callable, Optional
+from unittest import mock
+
+import quiz.quiz as quiz_module
+from src.main.models.models import Level, Lesson, Question, Option, StudentAttempt, User
+from src.main.content_catalog import ContentCatalog
+
+QUESTIONS_PER_LESSON = 10
+OPTIONS_PER_QUESTION = 4
+
+def make_catalog(lessons: int) -> ContentCatalog:
+    """Build a catalog of synthetic content without touching MySQL"""
+    levels = [Level(1, 'Beginner', 'Description', 1)]
+    lesson_rows = [Lesson(l, f"Lesson {l}", 'Description', 1, l) for l in range(1, lessons + 1)]
+    questions, options = [], []
+    for l in range(1, lessons + 1):
+        for n in range(QUESTIONS_PER_LESSON):
+            question_id = l * 100 + n
+            questions.append(Question(question_id, f"Question text {question_id}", l))
+            for o in range(OPTIONS_PER_QUESTION):
+                options.append(Option(question_id * 10 + o, question_id, f"Option {o}", o == 0, o + 1))
+    return ContentCatalog(levels, lesson_rows, questions, options)
+
+def stub_attempt(**kwargs) -> StudentAttempt:
+    """The attempt StudentAttempt.create would have inserted"""
+    return StudentAttempt(1, kwargs['user_id'], kwargs['lesson_id'], kwargs['score'],
+                          kwargs['total_questions'], kwargs['correct_answers'])
+
+@contextmanager
+def quiz_stubs(catalog: ContentCatalog, create: Callable[..., StudentAttempt] = stub_attempt,
+               record_answers: Optional[Callable] = None, **quiz_attributes):
+    """Run quiz.quiz against catalog with attempt writes and user loads stubbed out
+
+    create(**kwargs) and record_answers(attempt, answers) stand in for the
+    StudentAttempt methods; quiz_attributes replace further quiz.quiz module
+    attributes (session_store, session_lock, ...). Yields the ExitStack so
+    callers can add their own patches.
+    """
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(quiz_module, 'content_catalog', lambda: catalog))
+        stack.enter_context(mock.patch.object(quiz_module, 'transaction', nullcontext))
+        stack.enter_context(mock.patch.object(StudentAttempt, 'create',
+                                              classmethod(lambda cls, **kwargs: create(**kwargs))))
+        stack.enter_context(mock.patch.object(StudentAttempt, 'record_answers',
+                                              lambda attempt, answers: record_answers and record_answers(attempt, answers)))
+        stack.enter_context(mock.patch.object(User, 'by_id', classmethod(lambda cls, user_id: None)))
+        for name, value in quiz_attributes.items():
+            stack.enter_context(mock.patch.object(quiz_module, name, value))
+        yield stack
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+/quiz/submit hot path load test for WORDIAMO
+Runs a few hundred concurrent quizzes through quiz.submit_answer on a
+thread pool and reports per-submit latency percentiles and how many
+database statements reached DatabaseManager (should be zero)
+
+Uses the in-memory session store and a synthetic content catalog; the
+writes made on completion are stubbed above the database layer, so any
+counted statement came from the submit path. Run from the project root:
+python benchmarks/load_submit.py [concurrent_quizzes] [threads]
+"""
+
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz.quiz as quiz_module
+from quiz.quiz import QuizSession, submit_answer
+from src.main.database import DatabaseManager
+from benchmarks.common import make_catalog, quiz_stubs
+
+LESSONS = 20
+
+# Every DatabaseManager method that sends a statement to MySQL
+EXECUTE_METHODS = ('execute_query', 'iter_query', 'execute_query_in',
+                   'execute_insert', 'execute_update', 'execute_many')
+
+class StatementCounter:
+    """Stands in for each DatabaseManager execute method, counting calls"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+        return []
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted values"""
+    return values[max(int(len(values) * fraction) - 1, 0)]
+
+def play_quiz(user_id: int, latencies: list, completion: set):
+    """Answer every question of one quiz, timing each submit"""
+    session = quiz_module.load_session(user_id)
+    for item in session.questions:
+        question_id = item['question'].question_id
+        option_id = item['options'][0].option_id
+        started = time.perf_counter()
+        result = submit_answer(user_id, question_id, option_id)
+        elapsed = (time.perf_counter() - started) * 1000
+        assert result['success'], result
+        if result['quiz_complete']:
+            completion.add(user_id)
+        else:
+            latencies.append(elapsed)
+
+def main():
+    quizzes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    catalog = make_catalog(lessons=LESSONS)
+    counter = StatementCounter()
+
+    with quiz_stubs(catalog) as stack:
+        for method in EXECUTE_METHODS:
+            stack.enter_context(mock.patch.object(DatabaseManager, method, counter))
+        for user_id in range(1, quizzes + 1):
+            session = QuizSession(user_id, user_id % LESSONS + 1)
+            quiz_module.session_store.create(user_id, session.to_state())
+
+        latencies, completed = [], set()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for future in [pool.submit(play_quiz, user_id, latencies, completed)
+                           for user_id in range(1, quizzes + 1)]:
+                future.result()
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{quizzes} concurrent quizzes on {threads} threads, {len(latencies)} non-final submits")
+    print(f"p50 {percentile(latencies, 0.50):.3f} ms  p99 {percentile(latencies, 0.99):.3f} ms  "
+          f"max {latencies[-1]:.3f} ms  throughput {len(latencies) / wall:.0f} submits/s")
+    print(f"completed quizzes: {len(completed)}  DB statements: {counter.count}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Concurrent quiz session stress test for WORDIAMO
+Fires every answer of a few hundred quizzes at quiz.submit_answer twice
+(a double-clicked submit), in random order across a thread pool, and checks
+that no answer is lost and each quiz records exactly one attempt. Repeats
+for several thread counts and reports throughput
+
+The session store sleeps STORE_LATENCY_MS per load/save to stand in for the
+MySQL store's round trip, and attempt writes are stubbed with a similar
+delay. Pass --unlocked to disable the per-user session locks and watch the
+checks fail. Run from the project root:
+python benchmarks/stress_quiz_sessions.py [quizzes] [--unlocked]
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz.quiz as quiz_module
+from quiz.quiz import QuizSession, submit_answer
+from quiz.session_store import MemorySessionStore, RecentCompletions
+from src.main.models.models import StudentAttempt
+from benchmarks.common import make_catalog, quiz_stubs, QUESTIONS_PER_LESSON
+
+LESSONS = 20
+STORE_LATENCY_MS = 0.2
+ATTEMPT_LATENCY_MS = 1.0
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+class SlowSessionStore(MemorySessionStore):
+    """Memory store with a fixed delay per access, like a database round trip"""
+
+    def load(self, user_id):
+        time.sleep(STORE_LATENCY_MS / 1000)
+        return super().load(user_id)
+
+    def save(self, user_id, state):
+        time.sleep(STORE_LATENCY_MS / 1000)
+        super().save(user_id, state)
+
+class AttemptRecorder:
+    """Stands in for StudentAttempt.create/record_answers and counts what was written"""
+
+    def __init__(self):
+        self.attempts = Counter()
+        self.answers = {}
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        time.sleep(ATTEMPT_LATENCY_MS / 1000)
+        with self._lock:
+            self.attempts[kwargs['user_id']] += 1
+        return StudentAttempt(None, kwargs['user_id'], kwargs['lesson_id'], kwargs['score'],
+                              kwargs['total_questions'], kwargs['correct_answers'])
+
+    def record_answers(self, attempt, answers):
+        # One row per question; unanswered ones carry no selected option
+        answered = sum(1 for _, _, option_id, _ in answers if option_id is not None)
+        with self._lock:
+            self.answers[attempt.user_id] = answered
+
+def run(catalog, quizzes: int, threads: int, unlocked: bool):
+    """Play every quiz with duplicated submits; return (seconds, submits, recorder)"""
+    recorder = AttemptRecorder()
+    quiz_attributes = {
+        'session_store': SlowSessionStore(max_sessions=quizzes),
+        'recent_completions': RecentCompletions(),
+    }
+    if unlocked:
+        quiz_attributes['session_lock'] = lambda user_id: nullcontext()
+    with quiz_stubs(catalog, create=recorder.create, record_answers=recorder.record_answers,
+                    **quiz_attributes):
+        submits = []
+        for user_id in range(1, quizzes + 1):
+            session = QuizSession(user_id, user_id % LESSONS + 1)
+            quiz_module.session_store.create(user_id, session.to_state())
+            for item in session.questions:
+                submit = (user_id, item['question'].question_id, item['options'][0].option_id)
+                submits += [submit, submit]
+        random.Random(threads).shuffle(submits)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda submit: submit_answer(*submit), submits))
+        elapsed = time.perf_counter() - started
+    return elapsed, len(submits), recorder
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    quizzes = int(args[0]) if args else 200
+    unlocked = '--unlocked' in sys.argv
+    catalog = make_catalog(lessons=LESSONS)
+
+    print(f"{quizzes} quizzes x {QUESTIONS_PER_LESSON} questions, every answer submitted twice"
+          f"{' (session locks disabled)' if unlocked else ''}")
+    print(f"{'threads':>8} {'submits/s':>10} {'attempts':>9} {'duplicate':>10} {'missing':>8} {'lost answers':>13}")
+    failed = False
+    for threads in THREAD_COUNTS:
+        elapsed, submits, recorder = run(catalog, quizzes, threads, unlocked)
+        duplicate = sum(1 for count in recorder.attempts.values() if count > 1)
+        missing = quizzes - len(recorder.attempts)
+        lost = sum(QUESTIONS_PER_LESSON - recorder.answers.get(user_id, 0)
+                   for user_id in range(1, quizzes + 1))
+        failed = failed or duplicate or missing or lost
+        print(f"{threads:>8} {submits / elapsed:>10.0f} {sum(recorder.attempts.values()):>9} "
+              f"{duplicate:>10} {missing:>8} {lost:>13}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+-- Recompute lesson_stats from lessons, questions and student_attempts (safe to re-run)
+USE english_learning_db;
+
+INSERT INTO lesson_stats (lesson_id, question_count, attempt_count, score_total)
+SELECT
+    l.lesson_id,
+    (SELECT COUNT(*) FROM questions q WHERE q.lesson_id = l.lesson_id),
+    (SELECT COUNT(*) FROM student_attempts sa WHERE sa.lesson_id = l.lesson_id),
+    (SELECT COALESCE(SUM(sa.score), 0) FROM student_attempts sa WHERE sa.lesson_id = l.lesson_id)
+FROM lessons l
+ON DUPLICATE KEY UPDATE
+    question_count = VALUES(question_count),
+    attempt_count = VALUES(attempt_count),
+    score_total = VALUES(score_total);
@@ -0,0 +1,26 @@
+-- Rebuild user_lesson_progress from student_attempts (safe to re-run)
+USE english_learning_db;
+
+INSERT INTO user_lesson_progress
+    (user_id, lesson_id, best_score, attempt_count, passed_attempts, passed_score_total,
+     first_passed_at, last_passed_at, last_attempt_at)
+SELECT
+    user_id,
+    lesson_id,
+    MAX(score),
+    COUNT(*),
+    SUM(score >= 70),
+    SUM(CASE WHEN score >= 70 THEN score ELSE 0 END),
+    MIN(CASE WHEN score >= 70 THEN attempt_date END),
+    MAX(CASE WHEN score >= 70 THEN attempt_date END),
+    MAX(attempt_date)
+FROM student_attempts
+GROUP BY user_id, lesson_id
+ON DUPLICATE KEY UPDATE
+    best_score = VALUES(best_score),
+    attempt_count = VALUES(attempt_count),
+    passed_attempts = VALUES(passed_attempts),
+    passed_score_total = VALUES(passed_score_total),
+    first_passed_at = VALUES(first_passed_at),
+    last_passed_at = VALUES(last_passed_at),
+    last_attempt_at = VALUES(last_attempt_at);
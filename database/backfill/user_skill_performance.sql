@@ -0,0 +1,28 @@
+-- Rebuild user_skill_performance from user_answers (safe to re-run)
+USE english_learning_db;
+
+INSERT INTO user_skill_performance
+    (user_id, question_type, questions_attempted, correct_answers, attempts, score_total, lessons_attempted)
+SELECT
+    per_attempt.user_id,
+    per_attempt.question_type,
+    SUM(per_attempt.answered),
+    SUM(per_attempt.correct),
+    COUNT(*),
+    SUM(per_attempt.score),
+    COUNT(DISTINCT per_attempt.lesson_id)
+FROM (
+    SELECT sa.attempt_id, sa.user_id, sa.lesson_id, sa.score, q.question_type,
+           COUNT(*) AS answered, SUM(ua.is_correct) AS correct
+    FROM user_answers ua
+    JOIN student_attempts sa ON sa.attempt_id = ua.attempt_id
+    JOIN questions q ON q.question_id = ua.question_id
+    GROUP BY sa.attempt_id, sa.user_id, sa.lesson_id, sa.score, q.question_type
+) per_attempt
+GROUP BY per_attempt.user_id, per_attempt.question_type
+ON DUPLICATE KEY UPDATE
+    questions_attempted = VALUES(questions_attempted),
+    correct_answers = VALUES(correct_answers),
+    attempts = VALUES(attempts),
+    score_total = VALUES(score_total),
+    lessons_attempted = VALUES(lessons_attempted);
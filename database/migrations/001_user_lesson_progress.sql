@@ -0,0 +1,18 @@
+-- Per-user lesson progress, maintained whenever a student attempt is saved
+USE english_learning_db;
+
+CREATE TABLE IF NOT EXISTS user_lesson_progress (
+    user_id INT NOT NULL,
+    lesson_id INT NOT NULL,
+    best_score INT NOT NULL DEFAULT 0,
+    attempt_count INT NOT NULL DEFAULT 0,
+    passed_attempts INT NOT NULL DEFAULT 0,
+    passed_score_total INT NOT NULL DEFAULT 0,
+    first_passed_at TIMESTAMP NULL DEFAULT NULL,
+    last_passed_at TIMESTAMP NULL DEFAULT NULL,
+    last_attempt_at TIMESTAMP NULL DEFAULT NULL,
+    PRIMARY KEY (user_id, lesson_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (lesson_id) REFERENCES lessons(lesson_id) ON DELETE CASCADE,
+    INDEX idx_lesson_progress (lesson_id)
+);
@@ -0,0 +1,27 @@
+-- Per-question answers and per-user skill rollups, written when a quiz is completed
+USE english_learning_db;
+
+CREATE TABLE IF NOT EXISTS user_answers (
+    answer_id INT AUTO_INCREMENT PRIMARY KEY,
+    attempt_id INT NOT NULL,
+    question_id INT NOT NULL,
+    selected_option_id INT DEFAULT NULL,
+    is_correct BOOLEAN NOT NULL DEFAULT FALSE,
+    FOREIGN KEY (attempt_id) REFERENCES student_attempts(attempt_id) ON DELETE CASCADE,
+    FOREIGN KEY (question_id) REFERENCES questions(question_id) ON DELETE CASCADE,
+    FOREIGN KEY (selected_option_id) REFERENCES options(option_id) ON DELETE SET NULL,
+    UNIQUE KEY uq_attempt_question (attempt_id, question_id),
+    INDEX idx_question_answers (question_id)
+);
+
+CREATE TABLE IF NOT EXISTS user_skill_performance (
+    user_id INT NOT NULL,
+    question_type ENUM('vocabulary', 'grammar', 'sentence_formation', 'fill_in_blank', 'error_correction', 'reading_comprehension') NOT NULL,
+    questions_attempted INT NOT NULL DEFAULT 0,
+    correct_answers INT NOT NULL DEFAULT 0,
+    attempts INT NOT NULL DEFAULT 0,
+    score_total INT NOT NULL DEFAULT 0,
+    lessons_attempted INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, question_type),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
@@ -0,0 +1,12 @@
+-- Per-lesson aggregates, maintained on attempt insert; question_count is
+-- refreshed by the lesson_stats backfill (setup_database.py --recompute-stats)
+USE english_learning_db;
+
+CREATE TABLE IF NOT EXISTS lesson_stats (
+    lesson_id INT PRIMARY KEY,
+    question_count INT NOT NULL DEFAULT 0,
+    attempt_count INT NOT NULL DEFAULT 0,
+    score_total BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (lesson_id) REFERENCES lessons(lesson_id) ON DELETE CASCADE
+);
@@ -0,0 +1,11 @@
+-- Active quiz sessions shared by all app workers (QUIZ_SESSION_STORE=mysql)
+USE english_learning_db;
+
+CREATE TABLE IF NOT EXISTS quiz_sessions (
+    user_id INT PRIMARY KEY,
+    lesson_id INT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    INDEX idx_session_updated (updated_at)
+);
@@ -0,0 +1,59 @@
+-- Content version marker: triggers bump it on every content write, so app
+-- workers can tell with a single-row read when to reload the content catalog
+USE english_learning_db;
+
+CREATE TABLE IF NOT EXISTS content_version (
+    id TINYINT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO content_version (id, version) VALUES (1, 0);
+
+DROP TRIGGER IF EXISTS levels_insert_content_version;
+CREATE TRIGGER levels_insert_content_version AFTER INSERT ON levels
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS levels_update_content_version;
+CREATE TRIGGER levels_update_content_version AFTER UPDATE ON levels
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS levels_delete_content_version;
+CREATE TRIGGER levels_delete_content_version AFTER DELETE ON levels
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS lessons_insert_content_version;
+CREATE TRIGGER lessons_insert_content_version AFTER INSERT ON lessons
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS lessons_update_content_version;
+CREATE TRIGGER lessons_update_content_version AFTER UPDATE ON lessons
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS lessons_delete_content_version;
+CREATE TRIGGER lessons_delete_content_version AFTER DELETE ON lessons
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS questions_insert_content_version;
+CREATE TRIGGER questions_insert_content_version AFTER INSERT ON questions
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS questions_update_content_version;
+CREATE TRIGGER questions_update_content_version AFTER UPDATE ON questions
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS questions_delete_content_version;
+CREATE TRIGGER questions_delete_content_version AFTER DELETE ON questions
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS options_insert_content_version;
+CREATE TRIGGER options_insert_content_version AFTER INSERT ON options
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS options_update_content_version;
+CREATE TRIGGER options_update_content_version AFTER UPDATE ON options
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
+
+DROP TRIGGER IF EXISTS options_delete_content_version;
+CREATE TRIGGER options_delete_content_version AFTER DELETE ON options
+FOR EACH ROW UPDATE content_version SET version = version + 1 WHERE id = 1;
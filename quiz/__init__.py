@@ -1,11 +1,13 @@
 """Quiz engine module for WORDIAMO English Learning Platform"""
 
 from .quiz import (
-    QuizSession, start_quiz, submit_answer, quiz_progress, 
-    end_quiz_session, quiz_history, can_access_lesson, format_question
+    QuizSession, start_quiz, submit_answer, submit_batch, quiz_progress, 
+    end_quiz_session, quiz_history, quiz_history_page, can_access_lesson, format_question,
+    quiz_session_stats, start_session_sweeper
 )
 
 __all__ = [
-    'QuizSession', 'start_quiz', 'submit_answer', 'quiz_progress',
-    'end_quiz_session', 'quiz_history', 'can_access_lesson', 'format_question'
+    'QuizSession', 'start_quiz', 'submit_answer', 'submit_batch', 'quiz_progress',
+    'end_quiz_session', 'quiz_history', 'quiz_history_page', 'can_access_lesson', 'format_question',
+    'quiz_session_stats', 'start_session_sweeper'
 ]
\ No newline at end of file
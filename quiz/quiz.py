@@ -3,23 +3,38 @@ Quiz engine for WORDIAMO English Learning Platform
 Handles quiz sessions, scoring, validation, and attempt tracking
 """
 
-import time
+import base64
+import binascii
+import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from src.main.models import User, Lesson, Question, Option, StudentAttempt
-from src.main.database import query, insert
+from typing import Dict, List, Any, Optional, Tuple, Mapping
+from src.main.models import User, Lesson, StudentAttempt
+from src.main.database import transaction, DatabaseSaturatedError
+from src.main.content_catalog import content_catalog
+from .session_store import session_store_from_env, RecentCompletions
 
-# Global storage for active quiz sessions
-active_sessions = {}  # user_id: session_data
+# Active quiz sessions, shared by all workers when QUIZ_SESSION_STORE=mysql
+session_store = session_store_from_env()
+
+def session_lock(user_id: int):
+    """Serialize work on one user's session (see SessionStore.lock)"""
+    return session_store.lock(user_id)
+
+# Results of just-finished quizzes, so duplicate final submits don't fail or double-insert
+recent_completions = RecentCompletions()
 
 class QuizSession:
     """Represents an active quiz session"""
     
+    __slots__ = ('user_id', 'lesson_id', 'start_time', 'questions', 'answer_key', 'answers',
+                 'current_question_index', 'completed')
+    
     def __init__(self, user_id: int, lesson_id: int):
         self.user_id = user_id
         self.lesson_id = lesson_id
         self.start_time = datetime.now()
-        self.questions = []
+        self.questions = ()
+        self.answer_key = {}
         self.answers = {}
         self.current_question_index = 0
         self.completed = False
@@ -29,17 +44,45 @@ class QuizSession:
     
     def _load_questions(self):
         """Load all questions for the lesson with their options"""
-        lesson = Lesson.by_id(self.lesson_id)
+        catalog = content_catalog()
+        lesson = catalog.lesson(self.lesson_id)
         if not lesson:
             raise ValueError(f"Lesson {self.lesson_id} not found")
         
-        questions = Question.by_lesson(self.lesson_id)
-        for question in questions:
-            options = Option.by_question(question.question_id)
-            self.questions.append({
-                'question': question,
-                'options': options
-            })
+        # Sessions share the catalog's read-only question/option entries and answer key
+        self.questions = catalog.quiz_items(self.lesson_id)
+        self.answer_key = catalog.answer_key(self.lesson_id)
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize to ids and answers for the session store"""
+        return {
+            'user_id': self.user_id,
+            'lesson_id': self.lesson_id,
+            'started_at': self.start_time.timestamp(),
+            'question_ids': [item['question'].question_id for item in self.questions],
+            'answers': [[question_id, option_id] for question_id, option_id in self.answers.items()],
+            'index': self.current_question_index
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'QuizSession':
+        """Rebuild a session from to_state() output using the content catalog"""
+        catalog = content_catalog()
+        items = {item['question'].question_id: item for item in catalog.quiz_items(state['lesson_id'])}
+        missing = [qid for qid in state['question_ids'] if qid not in items]
+        if missing:
+            raise ValueError(f"Questions {missing} are no longer in lesson {state['lesson_id']}")
+        
+        session = cls.__new__(cls)
+        session.user_id = state['user_id']
+        session.lesson_id = state['lesson_id']
+        session.start_time = datetime.fromtimestamp(state['started_at'])
+        session.questions = tuple(items[qid] for qid in state['question_ids'])
+        session.answer_key = catalog.answer_key(state['lesson_id'])
+        session.answers = {question_id: option_id for question_id, option_id in state['answers']}
+        session.current_question_index = state['index']
+        session.completed = False
+        return session
     
     def question_count(self) -> int:
         """Get total number of questions in quiz"""
@@ -59,6 +102,25 @@ class QuizSession:
         self.answers[question_id] = option_id
         return True
     
+    def question_item(self, question_id: int) -> Optional[Mapping[str, Any]]:
+        """Get this session's {'question', 'options'} entry for a question"""
+        for item in self.questions:
+            if item['question'].question_id == question_id:
+                return item
+        return None
+    
+    def is_correct(self, question_id: int, option_id: Optional[int]) -> bool:
+        """Check an answer against the session's answer key"""
+        return option_id in self.answer_key.get(question_id, ())
+    
+    def correct_option_id(self, question_id: int) -> Optional[int]:
+        """Get the first correct option (by option_order) of a question in this session"""
+        correct = self.answer_key.get(question_id)
+        item = self.question_item(question_id) if correct else None
+        if item is None:
+            return None
+        return next((opt.option_id for opt in item['options'] if opt.option_id in correct), None)
+    
     def next_question(self) -> bool:
         """Move to next question"""
         if self.current_question_index < len(self.questions) - 1:
@@ -75,17 +137,9 @@ class QuizSession:
         if not self.is_complete():
             raise ValueError("Quiz is not complete")
         
-        correct_answers = 0
         total_questions = len(self.questions)
-        
-        for question_data in self.questions:
-            question = question_data['question']
-            question_id = question.question_id
-            
-            if question_id in self.answers:
-                submitted_option_id = self.answers[question_id]
-                if question.validate_answer(submitted_option_id):
-                    correct_answers += 1
+        correct_answers = sum(1 for question_id, option_id in self.answers.items()
+                              if self.is_correct(question_id, option_id))
         
         score_percentage = int((correct_answers / total_questions) * 100) if total_questions > 0 else 0
         return score_percentage, correct_answers, total_questions
@@ -95,6 +149,30 @@ class QuizSession:
         completion_time = datetime.now() - self.start_time
         return int(completion_time.total_seconds() / 60)
 
+def load_session(user_id: int) -> Optional[QuizSession]:
+    """Get a user's active quiz session from the session store"""
+    state = session_store.load(user_id)
+    if state is None:
+        return None
+    try:
+        return QuizSession.from_state(state)
+    except ValueError:
+        # Lesson content changed under the session; it can't be finished
+        session_store.delete(user_id)
+        return None
+
+def save_session(session: QuizSession):
+    """Write a session back to the session store"""
+    session_store.save(session.user_id, session.to_state())
+
+def quiz_session_stats() -> Dict[str, Any]:
+    """Get active quiz session count and created/completed/expired/evicted counters"""
+    return session_store.stats()
+
+def start_session_sweeper(interval: float = 60):
+    """Expire idle quiz sessions in the background every interval seconds"""
+    return session_store.start_sweeper(interval)
+
 def start_quiz(user_id: int, lesson_id: int) -> Dict[str, Any]:
     """Start a new quiz session"""
     try:
@@ -103,7 +181,7 @@ def start_quiz(user_id: int, lesson_id: int) -> Dict[str, Any]:
         if not user:
             return {'success': False, 'message': 'User not found'}
         
-        lesson = Lesson.by_id(lesson_id)
+        lesson = content_catalog().lesson(lesson_id)
         if not lesson:
             return {'success': False, 'message': 'Lesson not found'}
         
@@ -111,13 +189,10 @@ def start_quiz(user_id: int, lesson_id: int) -> Dict[str, Any]:
         if not can_access_lesson(user, lesson):
             return {'success': False, 'message': 'Access denied to this lesson'}
         
-        # End any existing session for this user
-        if user_id in active_sessions:
-            del active_sessions[user_id]
-        
-        # Create new quiz session
+        # Create new quiz session, replacing any existing one for this user
         session = QuizSession(user_id, lesson_id)
-        active_sessions[user_id] = session
+        with session_lock(user_id):
+            session_store.create(user_id, session.to_state())
         
         # Get first question
         first_question = session.current_question()
@@ -135,59 +210,155 @@ def start_quiz(user_id: int, lesson_id: int) -> Dict[str, Any]:
             'question': format_question(first_question) if first_question else None
         }
         
+    except DatabaseSaturatedError:
+        raise
     except Exception as e:
         return {'success': False, 'message': f'Failed to start quiz: {str(e)}'}
 
 def submit_answer(user_id: int, question_id: int, option_id: int) -> Dict[str, Any]:
-    """Submit answer for current question"""
+    """Submit answer for current question
+    
+    Answered entirely from session state; the database is only touched when
+    the last answer completes the quiz (and by the MySQL session store).
+    """
     try:
-        if user_id not in active_sessions:
-            return {'success': False, 'message': 'No active quiz session'}
-        
-        session = active_sessions[user_id]
-        
-        # Submit answer
-        if not session.submit_answer(question_id, option_id):
-            return {'success': False, 'message': 'Question already answered'}
-        
-        # Get the question to check if answer is correct
-        question = Question.by_id(question_id)
-        is_correct = question.validate_answer(option_id) if question else False
+        with session_lock(user_id):
+            return _submit_answer(user_id, question_id, option_id)
+    except DatabaseSaturatedError:
+        raise
+    except Exception as e:
+        return {'success': False, 'message': f'Failed to submit answer: {str(e)}'}
+
+def _submit_answer(user_id: int, question_id: int, option_id: int) -> Dict[str, Any]:
+    """submit_answer body; the caller holds the user's session lock"""
+    session = load_session(user_id)
+    if session is None:
+        # Resending the answer that finished the quiz gets its result again
+        return recent_completions.match(user_id, {question_id: option_id}) or \
+            {'success': False, 'message': 'No active quiz session'}
+    
+    # Only accept options of questions that belong to this quiz
+    item = session.question_item(question_id)
+    if item is None:
+        return {'success': False, 'message': 'Question is not part of this quiz'}
+    if not any(opt.option_id == option_id for opt in item['options']):
+        return {'success': False, 'message': 'Option does not belong to this question'}
+    
+    # Submit answer
+    if not session.submit_answer(question_id, option_id):
+        return {'success': False, 'message': 'Question already answered'}
+    
+    # Feedback comes from the session's answer key
+    is_correct = session.is_correct(question_id, option_id)
+    correct_option_id = session.correct_option_id(question_id)
+    
+    # Check if quiz is complete
+    if session.is_complete():
+        return complete_quiz(user_id, session, {question_id: option_id})
+    
+    # Move to next question
+    session.next_question()
+    next_question = session.current_question()
+    save_session(session)
+    
+    return {
+        'success': True,
+        'message': 'Answer submitted successfully',
+        'quiz_complete': False,
+        'is_correct': is_correct,
+        'correct_option_id': correct_option_id,
+        'current_question_index': session.current_question_index,
+        'question': format_question(next_question) if next_question else None
+    }
+
+def submit_batch(user_id: int, answers: List[Dict[str, Any]], lesson_id: Optional[int] = None) -> Dict[str, Any]:
+    """Submit every remaining answer of a quiz at once and complete it
+    
+    Answers go to the active session, or, when lesson_id is given, to a new
+    session for that lesson (no /quiz/start needed). Returns the
+    complete_quiz result once every question is answered. Resending the
+    exact batch that completed the quiz gets the original result back.
+    """
+    try:
+        with session_lock(user_id):
+            return _submit_batch(user_id, answers, lesson_id)
+    except DatabaseSaturatedError:
+        raise
+    except Exception as e:
+        return {'success': False, 'message': f'Failed to submit answers: {str(e)}'}
+
+def _submit_batch(user_id: int, answers: List[Dict[str, Any]], lesson_id: Optional[int]) -> Dict[str, Any]:
+    """submit_batch body; the caller holds the user's session lock"""
+    if lesson_id is not None:
+        user = User.by_id(user_id)
+        if not user:
+            return {'success': False, 'message': 'User not found'}
         
-        # Get correct option for feedback
-        correct_option_id = None
-        if question:
-            options = Option.by_question(question_id)
-            correct_option = next((opt for opt in options if opt.is_correct), None)
-            correct_option_id = correct_option.option_id if correct_option else None
+        lesson = content_catalog().lesson(lesson_id)
+        if not lesson:
+            return {'success': False, 'message': 'Lesson not found'}
         
-        # Check if quiz is complete
-        if session.is_complete():
-            return complete_quiz(user_id)
+        if not can_access_lesson(user, lesson):
+            return {'success': False, 'message': 'Access denied to this lesson'}
         
-        # Move to next question
-        session.next_question()
-        next_question = session.current_question()
+        session = QuizSession(user_id, lesson_id)
+    else:
+        session = load_session(user_id)
+        if session is None:
+            # Resending the batch that finished the quiz gets its result again
+            return recent_completions.match(user_id, _answer_map(answers)) or \
+                {'success': False, 'message': 'No active quiz session'}
+    
+    # Validate everything before applying anything
+    submitted = {}
+    for answer in answers:
+        try:
+            question_id, option_id = int(answer['question_id']), int(answer['option_id'])
+        except (KeyError, TypeError, ValueError):
+            return {'success': False, 'message': 'Each answer needs integer question_id and option_id'}
         
-        return {
-            'success': True,
-            'message': 'Answer submitted successfully',
-            'quiz_complete': False,
-            'is_correct': is_correct,
-            'correct_option_id': correct_option_id,
-            'current_question_index': session.current_question_index,
-            'question': format_question(next_question) if next_question else None
-        }
+        item = session.question_item(question_id)
+        if item is None:
+            return {'success': False, 'message': f'Question {question_id} is not part of this quiz'}
+        if not any(opt.option_id == option_id for opt in item['options']):
+            return {'success': False, 'message': f'Option {option_id} does not belong to question {question_id}'}
+        if question_id in submitted or question_id in session.answers:
+            return {'success': False, 'message': f'Question {question_id} already answered'}
+        submitted[question_id] = option_id
+    
+    for question_id, option_id in submitted.items():
+        session.submit_answer(question_id, option_id)
+    
+    if not session.is_complete():
+        missing = [item['question'].question_id for item in session.questions
+                   if item['question'].question_id not in session.answers]
+        return {'success': False, 'message': 'Not every question was answered',
+                'missing_question_ids': missing}
+    
+    if lesson_id is not None:
+        # A resent request, not a retake: same lesson and the very same answers
+        duplicate = recent_completions.match(user_id, submitted, lesson_id)
+        if duplicate:
+            return duplicate
         
-    except Exception as e:
-        return {'success': False, 'message': f'Failed to submit answer: {str(e)}'}
+        # Replaces any quiz in progress, as /quiz/start would
+        session_store.create(user_id, session.to_state())
+    
+    return complete_quiz(user_id, session, submitted)
+
+def _answer_map(answers: List[Dict[str, Any]]) -> Dict[int, int]:
+    """question_id -> option_id for a batch, empty if any answer is malformed"""
+    try:
+        return {int(answer['question_id']): int(answer['option_id']) for answer in answers}
+    except (KeyError, TypeError, ValueError):
+        return {}
 
 def quiz_progress(user_id: int) -> Dict[str, Any]:
     """Get current quiz progress"""
-    if user_id not in active_sessions:
+    session = load_session(user_id)
+    if session is None:
         return {'success': False, 'message': 'No active quiz session'}
     
-    session = active_sessions[user_id]
     current_question = session.current_question()
     
     return {
@@ -202,9 +373,25 @@ def quiz_progress(user_id: int) -> Dict[str, Any]:
         'question': format_question(current_question) if current_question else None
     }
 
-def complete_quiz(user_id: int) -> Dict[str, Any]:
-    """Complete quiz and save results"""
-    session = active_sessions[user_id]
+def complete_quiz(user_id: int, session: Optional[QuizSession] = None,
+                  submitted: Optional[Mapping[int, int]] = None) -> Dict[str, Any]:
+    """Complete quiz and save results
+    
+    Idempotent: the session is claimed before anything is written, so of two
+    concurrent completions only one records an attempt. submitted is the
+    answers of the request that finished the quiz (all answers by default);
+    resending exactly those returns this result again.
+    """
+    with session_lock(user_id):
+        return _complete_quiz(user_id, session, submitted)
+
+def _complete_quiz(user_id: int, session: Optional[QuizSession],
+                   submitted: Optional[Mapping[int, int]]) -> Dict[str, Any]:
+    """complete_quiz body; the caller holds the user's session lock"""
+    if session is None:
+        session = load_session(user_id)
+        if session is None:
+            return {'success': False, 'message': 'No active quiz session'}
     
     # Calculate score
     score_percentage, correct_answers, total_questions = session.calculate_score()
@@ -213,39 +400,55 @@ def complete_quiz(user_id: int) -> Dict[str, Any]:
     # Determine if lesson is completed (passing score >= 70%)
     is_completed = score_percentage >= 70
     
-    # Save attempt to database
-    attempt = StudentAttempt.create(
-        user_id=session.user_id,
-        lesson_id=session.lesson_id,
-        score=score_percentage,
-        total_questions=total_questions,
-        correct_answers=correct_answers,
-        completion_time_minutes=completion_time,
-        is_completed=is_completed
-    )
-    
-    # Check for level progression if lesson completed
-    level_upgrade_info = None
-    if is_completed:
-        user = User.by_id(user_id)
-        if user:
-            upgrade_check = user.check_level_upgrade()
-            if upgrade_check['can_upgrade']:
-                # Upgrade user to next level
-                if user.upgrade_level():
-                    level_upgrade_info = {
-                        'upgraded': True,
-                        'new_level_id': upgrade_check['next_level_id'],
-                        'new_level_name': upgrade_check['next_level_name'],
-                        'completion_progress': upgrade_check['current_progress']
-                    }
+    # Save attempt and any level upgrade together
+    try:
+        with transaction():
+            # Claim the session first; with the MySQL store the delete also
+            # blocks a completion racing in from another worker until commit
+            if not session_store.complete(user_id):
+                return {'success': False, 'message': 'Quiz already completed'}
+            
+            # Save attempt to database
+            attempt = StudentAttempt.create(
+                user_id=session.user_id,
+                lesson_id=session.lesson_id,
+                score=score_percentage,
+                total_questions=total_questions,
+                correct_answers=correct_answers,
+                completion_time_minutes=completion_time,
+                is_completed=is_completed
+            )
+            
+            # Keep every answer for the skill breakdowns
+            attempt.record_answers(session_answers(session))
+            
+            # Check for level progression if lesson completed
+            level_upgrade_info = None
+            if is_completed:
+                user = User.by_id(user_id)
+                if user:
+                    upgrade_check = user.check_level_upgrade()
+                    if upgrade_check['can_upgrade']:
+                        # Upgrade user to next level
+                        if user.upgrade_level():
+                            level_upgrade_info = {
+                                'upgraded': True,
+                                'new_level_id': upgrade_check['next_level_id'],
+                                'new_level_name': upgrade_check['next_level_name'],
+                                'completion_progress': upgrade_check['current_progress']
+                            }
+    except Exception:
+        # Nothing was saved: put the session back without the final request's
+        # answers, so resending that request retries the completion
+        state = session.to_state()
+        if submitted:
+            state['answers'] = [answer for answer in state['answers'] if answer[0] not in submitted]
+        session_store.save(user_id, state)
+        raise
     
     # Get detailed results
     results = detailed_results(session)
     
-    # Clean up session
-    del active_sessions[user_id]
-    
     response = {
         'success': True,
         'message': 'Quiz completed successfully',
@@ -266,8 +469,20 @@ def complete_quiz(user_id: int) -> Dict[str, Any]:
     if level_upgrade_info:
         response['level_upgrade'] = level_upgrade_info
     
+    recent_completions.remember(user_id, session.lesson_id,
+                                submitted if submitted is not None else session.answers, response)
     return response
 
+def session_answers(session: QuizSession) -> List[Tuple[int, str, Optional[int], bool]]:
+    """Get (question_id, question_type, selected_option_id, is_correct) for each question"""
+    answers = []
+    for question_data in session.questions:
+        question = question_data['question']
+        selected = session.answers.get(question.question_id)
+        answers.append((question.question_id, question.question_type, selected,
+                        session.is_correct(question.question_id, selected)))
+    return answers
+
 def detailed_results(session: QuizSession) -> List[Dict[str, Any]]:
     """Get detailed results for each question"""
     results = []
@@ -292,7 +507,7 @@ def detailed_results(session: QuizSession) -> List[Dict[str, Any]]:
                 'option_id': correct_options[0].option_id if correct_options else None,
                 'option_text': correct_options[0].option_text if correct_options else None
             },
-            'is_correct': question.validate_answer(submitted_option_id) if submitted_option_id else False
+            'is_correct': session.is_correct(question.question_id, submitted_option_id)
         })
     
     return results
@@ -328,22 +543,28 @@ def format_question(question_data: Dict[str, Any]) -> Dict[str, Any]:
 
 def end_quiz_session(user_id: int) -> bool:
     """End quiz session without saving results"""
-    if user_id in active_sessions:
-        del active_sessions[user_id]
-        return True
-    return False
+    with session_lock(user_id):
+        return session_store.delete(user_id)
 
 def quiz_history(user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
     """Get user's quiz attempt history"""
-    attempts = StudentAttempt.by_user(user_id)
+    return quiz_history_page(user_id, limit)['quiz_history']
+
+def quiz_history_page(user_id: int, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Get one page of quiz history, newest first, with the cursor for the next page"""
+    before = decode_history_cursor(cursor) if cursor else None
+    
+    # Fetch one extra row to learn whether another page exists
+    rows = StudentAttempt.history_page(user_id, limit + 1, before)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
     history = []
-    for attempt in attempts[:limit]:
-        lesson = Lesson.by_id(attempt.lesson_id)
+    for attempt, lesson_name in rows:
         history.append({
             'attempt_id': attempt.attempt_id,
             'lesson_id': attempt.lesson_id,
-            'lesson_name': lesson.lesson_name if lesson else 'Unknown',
+            'lesson_name': lesson_name,
             'score_percentage': attempt.score,
             'correct_answers': attempt.correct_answers,
             'total_questions': attempt.total_questions,
@@ -352,4 +573,23 @@ def quiz_history(user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
             'passing_score': attempt.is_passing_score()
         })
     
-    return history
\ No newline at end of file
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1][0]
+        next_cursor = encode_history_cursor(last.attempt_date, last.attempt_id)
+    
+    return {'quiz_history': history, 'next_cursor': next_cursor, 'has_more': has_more}
+
+def encode_history_cursor(attempt_date: datetime, attempt_id: int) -> str:
+    """Encode an (attempt_date, attempt_id) position as an opaque cursor"""
+    raw = json.dumps([attempt_date.isoformat(), attempt_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_history_cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        attempt_date, attempt_id = json.loads(raw)
+        return datetime.fromisoformat(attempt_date), int(attempt_id)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
\ No newline at end of file
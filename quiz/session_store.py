@@ -0,0 +1,297 @@
+"""
+Quiz session storage for WORDIAMO English Learning Platform
+Keeps serialized quiz session state either in process memory or in MySQL,
+with idle expiry, a size cap and lifecycle counters
+"""
+
+import json
+import os
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Mapping
+from src.main.database import query, update, transaction
+
+logger = logging.getLogger(__name__)
+
+class StripedLock:
+    """Fixed set of re-entrant locks picked by key, so unrelated users never contend"""
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def __call__(self, key: int) -> threading.RLock:
+        """Get the lock guarding key"""
+        return self._locks[hash(key) % len(self._locks)]
+
+class SessionStore(ABC):
+    """Where active quiz session state lives between requests
+
+    Stores hold the compact dict produced by QuizSession.to_state() (ids and
+    answers only), keyed by user ID, so any backend can be shared by
+    several worker processes. Sessions idle for longer than idle_ttl
+    seconds expire, and at most max_sessions are kept; the least recently
+    used are evicted beyond that. Load-modify-save sequences run under
+    lock(user_id).
+    """
+
+    def __init__(self, idle_ttl: float = 1800, max_sessions: int = 10000):
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self._counters = {'created': 0, 'completed': 0, 'expired': 0, 'evicted': 0}
+        self._counter_lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._locks = StripedLock()
+
+    def _count(self, name: str, amount: int = 1):
+        """Bump a lifecycle counter"""
+        if amount:
+            with self._counter_lock:
+                self._counters[name] += amount
+
+    @contextmanager
+    def lock(self, user_id: int):
+        """Hold a user's session for a load-modify-save; re-entrant
+
+        Only serializes threads of this process; stores shared by several
+        workers extend it.
+        """
+        with self._locks(user_id):
+            yield
+
+    @abstractmethod
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get the stored session state for a user, or None"""
+
+    @abstractmethod
+    def save(self, user_id: int, state: Dict[str, Any]):
+        """Store (or replace) a user's session state"""
+
+    @abstractmethod
+    def delete(self, user_id: int) -> bool:
+        """Remove a user's session; returns whether one existed"""
+
+    @abstractmethod
+    def active_count(self) -> int:
+        """Get the number of stored sessions"""
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Expire idle sessions; returns how many were removed"""
+
+    def create(self, user_id: int, state: Dict[str, Any]):
+        """Store a newly started session"""
+        self.save(user_id, state)
+        self._count('created')
+
+    def complete(self, user_id: int) -> bool:
+        """Remove a session whose quiz was finished; False if it was already gone"""
+        if not self.delete(user_id):
+            return False
+        self._count('completed')
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Get active session count and lifecycle counters"""
+        with self._counter_lock:
+            counters = dict(self._counters)
+        return {
+            'backend': type(self).__name__,
+            'active': self.active_count(),
+            'max_sessions': self.max_sessions,
+            'idle_ttl_seconds': self.idle_ttl,
+            **counters
+        }
+
+    def start_sweeper(self, interval: float = 60) -> threading.Thread:
+        """Run sweep() every interval seconds on a daemon thread"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return self._sweeper
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.warning(f"Quiz session sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=run, name='quiz-session-sweeper', daemon=True)
+        self._sweeper.start()
+        return self._sweeper
+
+class MemorySessionStore(SessionStore):
+    """Per-process store; only correct with a single worker process"""
+
+    def __init__(self, idle_ttl: float = 1800, max_sessions: int = 10000):
+        super().__init__(idle_ttl, max_sessions)
+        # user_id -> (last activity, serialized state), least recently used first
+        self._sessions: 'OrderedDict[int, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get the stored session state for a user, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(user_id)
+            if entry is None:
+                return None
+            if now - entry[0] > self.idle_ttl:
+                del self._sessions[user_id]
+                self._count('expired')
+                return None
+            self._sessions[user_id] = (now, entry[1])
+            self._sessions.move_to_end(user_id)
+        return json.loads(entry[1])
+
+    def save(self, user_id: int, state: Dict[str, Any]):
+        """Store (or replace) a user's session state"""
+        data = json.dumps(state, separators=(',', ':'))
+        with self._lock:
+            self._sessions[user_id] = (time.monotonic(), data)
+            self._sessions.move_to_end(user_id)
+            evicted = 0
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                evicted += 1
+        self._count('evicted', evicted)
+
+    def delete(self, user_id: int) -> bool:
+        """Remove a user's session; returns whether one existed"""
+        with self._lock:
+            return self._sessions.pop(user_id, None) is not None
+
+    def active_count(self) -> int:
+        """Get the number of stored sessions"""
+        return len(self._sessions)
+
+    def sweep(self) -> int:
+        """Expire idle sessions; returns how many were removed"""
+        cutoff = time.monotonic() - self.idle_ttl
+        expired = 0
+        with self._lock:
+            # Oldest activity first, so stop at the first live session
+            while self._sessions:
+                user_id, (last_activity, _) = next(iter(self._sessions.items()))
+                if last_activity > cutoff:
+                    break
+                del self._sessions[user_id]
+                expired += 1
+        self._count('expired', expired)
+        return expired
+
+class MySQLSessionStore(SessionStore):
+    """Store backed by the quiz_sessions table, shared by every worker
+
+    Counters are per process; the active count and expiry are table-wide.
+    """
+
+    @contextmanager
+    def lock(self, user_id: int):
+        """Hold a user's session for a load-modify-save, across workers too
+
+        Runs the block in one transaction, in which load() row-locks the
+        session until commit, so another worker's submit waits for this one.
+        """
+        with super().lock(user_id), transaction():
+            yield
+
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get the stored session state for a user, or None"""
+        # On the primary (a replica may not have the last answer yet); inside
+        # lock() the row stays locked until that transaction ends
+        sql = """
+        SELECT state FROM quiz_sessions
+        WHERE user_id = %s AND updated_at >= NOW() - INTERVAL %s SECOND
+        FOR UPDATE
+        """
+        result = query(sql, (user_id, int(self.idle_ttl)), primary=True)
+        return json.loads(result[0]['state']) if result else None
+
+    def save(self, user_id: int, state: Dict[str, Any]):
+        """Store (or replace) a user's session state"""
+        sql = """
+        INSERT INTO quiz_sessions (user_id, lesson_id, state) VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE lesson_id = VALUES(lesson_id), state = VALUES(state),
+            updated_at = CURRENT_TIMESTAMP
+        """
+        update(sql, (user_id, state['lesson_id'], json.dumps(state, separators=(',', ':'))))
+
+    def delete(self, user_id: int) -> bool:
+        """Remove a user's session; returns whether one existed"""
+        return update("DELETE FROM quiz_sessions WHERE user_id = %s", (user_id,)) > 0
+
+    def active_count(self) -> int:
+        """Get the number of stored sessions"""
+        result = query("SELECT COUNT(*) as count FROM quiz_sessions", primary=True)
+        return result[0]['count'] if result else 0
+
+    def sweep(self) -> int:
+        """Expire idle sessions and evict the oldest beyond max_sessions"""
+        expired = update(
+            "DELETE FROM quiz_sessions WHERE updated_at < NOW() - INTERVAL %s SECOND",
+            (int(self.idle_ttl),)
+        )
+        self._count('expired', expired)
+
+        excess = self.active_count() - self.max_sessions
+        if excess > 0:
+            evicted = update("DELETE FROM quiz_sessions ORDER BY updated_at LIMIT %s", (excess,))
+            self._count('evicted', evicted)
+        return expired
+
+class RecentCompletions:
+    """Short-lived record of finished quizzes, for answering duplicate submits
+
+    A double-clicked final answer (or a retried batch) arrives after its
+    session is gone. If it carries exactly the answers of the request that
+    finished the quiz, the original result is returned instead of an error
+    or a second attempt.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # user_id -> (expires at, lesson_id, answers, response)
+        self._entries: 'OrderedDict[int, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def remember(self, user_id: int, lesson_id: int, answers: Mapping[int, int], response: Dict[str, Any]):
+        """Record the result of a completed quiz and the answers that completed it"""
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, lesson_id, dict(answers), response)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def match(self, user_id: int, answers: Mapping[int, int],
+              lesson_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Get the recorded result if answers are exactly those that completed the user's last quiz"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        _, completed_lesson_id, completed_answers, response = entry
+        if lesson_id is not None and lesson_id != completed_lesson_id:
+            return None
+        if not answers or dict(answers) != completed_answers:
+            return None
+        return response
+
+SESSION_STORES = {
+    'memory': MemorySessionStore,
+    'mysql': MySQLSessionStore
+}
+
+def session_store_from_env() -> SessionStore:
+    """Build the session store named by QUIZ_SESSION_STORE (memory or mysql)"""
+    name = os.getenv('QUIZ_SESSION_STORE', 'memory').lower()
+    if name not in SESSION_STORES:
+        raise ValueError(f"Unknown QUIZ_SESSION_STORE '{name}', expected one of {', '.join(SESSION_STORES)}")
+    return SESSION_STORES[name](
+        idle_ttl=float(os.getenv('QUIZ_SESSION_IDLE_TTL', 1800)),
+        max_sessions=int(os.getenv('QUIZ_SESSION_MAX', 10000))
+    )
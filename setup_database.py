@@ -1,5 +1,6 @@
 import mysql.connector
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -96,6 +97,32 @@ def check_data(connection):
         print(f"Sample Data Check Error: {e}")
         return False
 
+def run_migrations(connection):
+    """Apply database/migrations/*.sql in order (each file is idempotent)"""
+    for migration in sorted(Path('database/migrations').glob('*.sql')):
+        print(f"  Applying {migration.name}")
+        if not run_sql_file(connection, migration):
+            return False
+    return True
+
+def run_backfills(names=None):
+    """Rebuild derived tables from database/backfill/*.sql, or only the named ones"""
+    connection = get_mysql_connection()
+    if not connection:
+        return False
+    try:
+        if not run_migrations(connection):
+            return False
+        for backfill in sorted(Path('database/backfill').glob('*.sql')):
+            if names and backfill.stem not in names:
+                continue
+            print(f"Backfilling {backfill.stem}...")
+            if not run_sql_file(connection, backfill):
+                return False
+        return True
+    finally:
+        connection.close()
+
 def setup_database():
     print(" WORDIAMO Database Setup")
     print("=" * 50)
@@ -143,6 +170,14 @@ def setup_database():
     else:
         print("Sample exists")
     
+    # Apply schema additions made after the base schema
+    print("\n5. Applying migrations...")
+    if run_migrations(connection):
+        print("Migrations applied")
+    else:
+        print("Failed to apply migrations")
+        return False
+    
     connection.close()
     
     print("\n" + "=" * 50)
@@ -155,6 +190,16 @@ def setup_database():
     return True
 
 if __name__ == "__main__":
+    # --backfill-progress rebuilds every derived table; --recompute-stats only lesson_stats
+    if '--backfill-progress' in sys.argv or '--recompute-stats' in sys.argv:
+        names = None if '--backfill-progress' in sys.argv else ['lesson_stats']
+        if run_backfills(names):
+            print("Backfill completed successfully")
+        else:
+            print("Backfill failed")
+            exit(1)
+        exit(0)
+    
     print("WORDIAMO Database Setup")
     print("This will create the database and load data if needed")
     print()
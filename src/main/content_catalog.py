@@ -0,0 +1,258 @@
+"""
+Content Catalog module for WORDIAMO English Learning Platform
+Immutable in-memory snapshot of levels, lessons, questions and options
+"""
+
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple, Mapping, Iterator
+from .models import Level, Lesson, Question, Option
+from .models.models import model_rows
+from .database import query, invalidate_cache
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TABLES = ('levels', 'lessons', 'questions', 'options')
+
+# Order of the questions.question_type ENUM, which is how MySQL sorts it
+QUESTION_TYPES = ('vocabulary', 'grammar', 'sentence_formation', 'fill_in_blank',
+                  'error_correction', 'reading_comprehension')
+
+def _group(items, key) -> Mapping[Any, Tuple]:
+    """Group items into a read-only mapping of tuples, keeping their order"""
+    grouped: Dict[Any, List] = {}
+    for item in items:
+        grouped.setdefault(key(item), []).append(item)
+    return MappingProxyType({k: tuple(v) for k, v in grouped.items()})
+
+class ContentCatalog:
+    """Indexed snapshot of all learning content
+
+    Built from one bulk query per content table and never mutated afterwards;
+    a reload builds a new catalog and swaps it in, so readers always see a
+    consistent version. Treat the model objects it hands out as read-only.
+    """
+
+    def __init__(self, levels: List[Level], lessons: List[Lesson],
+                 questions: List[Question], options: List[Option]):
+        self.loaded_at = datetime.now()
+
+        self.levels = tuple(sorted(levels, key=lambda l: l.level_order))
+        self.lessons = tuple(sorted(lessons, key=lambda l: (l.level_id, l.lesson_order)))
+        self.questions = tuple(sorted(questions, key=lambda q: (q.lesson_id, q.question_id)))
+
+        self.levels_by_id = MappingProxyType({level.level_id: level for level in self.levels})
+        self.lessons_by_id = MappingProxyType({lesson.lesson_id: lesson for lesson in self.lessons})
+        self.questions_by_id = MappingProxyType({q.question_id: q for q in self.questions})
+
+        self.lessons_by_level = _group(self.lessons, lambda l: l.level_id)
+        self.questions_by_lesson = _group(sorted(self.questions, key=lambda q: q.question_id),
+                                          lambda q: q.lesson_id)
+        self.questions_by_type = _group(self.questions, lambda q: q.question_type)
+        self.questions_by_difficulty = _group(self.questions, lambda q: q.difficulty_level)
+        self.options_by_question = _group(sorted(options, key=lambda o: (o.question_id, o.option_order)),
+                                          lambda o: o.question_id)
+
+        # Read-only {'question', 'options'} entries shared by every quiz session
+        self.quiz_items_by_lesson = MappingProxyType({
+            lesson_id: tuple(
+                MappingProxyType({'question': q, 'options': self.options_for(q.question_id)})
+                for q in questions
+            )
+            for lesson_id, questions in self.questions_by_lesson.items()
+        })
+        
+        # Answer keys for scoring: {lesson_id: {question_id: frozenset(correct option ids)}}
+        self.answer_keys_by_lesson = MappingProxyType({
+            lesson_id: MappingProxyType({
+                q.question_id: frozenset(o.option_id for o in self.options_for(q.question_id) if o.is_correct)
+                for q in questions
+            })
+            for lesson_id, questions in self.questions_by_lesson.items()
+        })
+
+        # Per-lesson skill breakdown: {lesson_id: {question_type: count}}
+        skills: Dict[int, Dict[str, int]] = {}
+        for question in self.questions:
+            lesson_skills = skills.setdefault(question.lesson_id, {})
+            lesson_skills[question.question_type] = lesson_skills.get(question.question_type, 0) + 1
+        self.skills_by_lesson = MappingProxyType(
+            {lesson_id: MappingProxyType(counts) for lesson_id, counts in skills.items()}
+        )
+
+        self.version = self._fingerprint(options)
+
+    @classmethod
+    def load(cls) -> 'ContentCatalog':
+        """Load all content with one query per table"""
+        levels = query("SELECT * FROM levels ORDER BY level_order", row_factory=model_rows(Level))
+        lessons = query("SELECT * FROM lessons ORDER BY level_id, lesson_order", row_factory=model_rows(Lesson))
+        questions = query("SELECT * FROM questions ORDER BY lesson_id, question_id", row_factory=model_rows(Question))
+        options = query("SELECT * FROM options ORDER BY question_id, option_order", row_factory=model_rows(Option))
+        return cls(levels, lessons, questions, options)
+
+    def _fingerprint(self, options: List[Option]) -> str:
+        """Content hash used as the catalog version"""
+        digest = hashlib.sha1()
+        for level in self.levels:
+            digest.update(repr((level.level_id, level.level_name, level.level_description,
+                                level.level_order)).encode('utf-8'))
+        for lesson in self.lessons:
+            digest.update(repr((lesson.lesson_id, lesson.lesson_name, lesson.lesson_description,
+                                lesson.level_id, lesson.lesson_order,
+                                lesson.estimated_time_minutes)).encode('utf-8'))
+        for question in self.questions:
+            digest.update(repr((question.question_id, question.question_text, question.lesson_id,
+                                question.question_type, question.difficulty_level)).encode('utf-8'))
+        for option in options:
+            digest.update(repr((option.option_id, option.question_id, option.option_text,
+                                bool(option.is_correct), option.option_order)).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def level(self, level_id: int) -> Optional[Level]:
+        """Get level by ID"""
+        return self.levels_by_id.get(level_id)
+
+    def lesson(self, lesson_id: int) -> Optional[Lesson]:
+        """Get lesson by ID"""
+        return self.lessons_by_id.get(lesson_id)
+
+    def question(self, question_id: int) -> Optional[Question]:
+        """Get question by ID"""
+        return self.questions_by_id.get(question_id)
+
+    def lessons_for_level(self, level_id: int) -> Tuple[Lesson, ...]:
+        """Get lessons of a level ordered by lesson_order"""
+        return self.lessons_by_level.get(level_id, ())
+
+    def questions_for_lesson(self, lesson_id: int) -> Tuple[Question, ...]:
+        """Get questions of a lesson ordered by question_id"""
+        return self.questions_by_lesson.get(lesson_id, ())
+
+    def questions_of_type(self, question_type: str) -> Tuple[Question, ...]:
+        """Get questions of a type ordered by lesson_id, question_id"""
+        return self.questions_by_type.get(question_type, ())
+
+    def find_questions(self, question_type: Optional[str] = None, level_id: Optional[int] = None,
+                       difficulty: Optional[str] = None,
+                       after_question_id: Optional[int] = None) -> Iterator[Question]:
+        """Iterate questions ordered by lesson_id, question_id, filtered lazily
+        
+        after_question_id resumes just past that question in the same order.
+        """
+        questions = self.questions_of_type(question_type) if question_type else self.questions
+        if after_question_id is not None:
+            anchor = self.question(after_question_id)
+            if anchor is None:
+                raise ValueError(f"Unknown question {after_question_id}")
+            position = (anchor.lesson_id, anchor.question_id)
+            questions = itertools.dropwhile(lambda q: (q.lesson_id, q.question_id) <= position, questions)
+        for question in questions:
+            if difficulty and question.difficulty_level != difficulty:
+                continue
+            if level_id and self.lessons_by_id[question.lesson_id].level_id != level_id:
+                continue
+            yield question
+    
+    def options_for(self, question_id: int) -> Tuple[Option, ...]:
+        """Get options of a question ordered by option_order"""
+        return self.options_by_question.get(question_id, ())
+
+    def quiz_items(self, lesson_id: int) -> Tuple[Mapping[str, Any], ...]:
+        """Get a lesson's questions paired with their options, as quiz sessions use them"""
+        return self.quiz_items_by_lesson.get(lesson_id, ())
+
+    def answer_key(self, lesson_id: int) -> Mapping[int, frozenset]:
+        """Get a lesson's correct option IDs keyed by question ID"""
+        return self.answer_keys_by_lesson.get(lesson_id, MappingProxyType({}))
+    
+    def lesson_count(self, level_id: int) -> int:
+        """Get number of lessons in a level"""
+        return len(self.lessons_for_level(level_id))
+
+    def question_count(self, lesson_id: int) -> int:
+        """Get number of questions in a lesson"""
+        return len(self.questions_for_lesson(lesson_id))
+
+    def skill_categories(self, lesson_id: int) -> Dict[str, int]:
+        """Get count of questions by skill type for a lesson"""
+        return dict(self.skills_by_lesson.get(lesson_id, {}))
+
+    def lessons_by_skill_focus(self, skill_type: str, level_id: Optional[int] = None) -> List[Lesson]:
+        """Get lessons with at least one question of a skill type"""
+        lessons = self.lessons_for_level(level_id) if level_id else self.lessons
+        return [lesson for lesson in lessons
+                if skill_type in self.skills_by_lesson.get(lesson.lesson_id, {})]
+
+# Current catalog; replaced wholesale on reload so readers never see a mix
+_catalog: Optional[ContentCatalog] = None
+_load_lock = threading.Lock()
+# content_version.version read when _catalog was loaded
+_content_version: Optional[int] = None
+_refresher: Optional[threading.Thread] = None
+
+def content_version() -> Optional[int]:
+    """Get content_version.version, which triggers bump on every content write"""
+    # On the primary and uncached, so a write is seen as soon as it commits
+    result = query("SELECT version FROM content_version WHERE id = 1", primary=True)
+    return result[0]['version'] if result else None
+
+def content_catalog() -> ContentCatalog:
+    """Get the current content catalog, loading it on first use"""
+    catalog = _catalog
+    if catalog is None:
+        with _load_lock:
+            if _catalog is None:
+                return reload_content_catalog()
+            catalog = _catalog
+    return catalog
+
+def reload_content_catalog() -> ContentCatalog:
+    """Load a fresh catalog and atomically swap it in"""
+    global _catalog, _content_version
+    # Content changed underneath us; don't rebuild from cached rows
+    invalidate_cache(*CONTENT_TABLES)
+    # Read before loading, so a write racing the load triggers another reload
+    try:
+        version = content_version()
+    except Exception as e:
+        logger.warning(f"Could not read content version: {e}")
+        version = None
+    catalog = ContentCatalog.load()
+    _catalog, _content_version = catalog, version
+    
+    logger.info(f"Content catalog {catalog.version} loaded: {len(catalog.levels)} levels, "
+                f"{len(catalog.lessons)} lessons, {len(catalog.questions)} questions")
+    return catalog
+
+def refresh_content_catalog() -> bool:
+    """Reload the catalog if the content version moved; returns whether it did"""
+    with _load_lock:
+        version = content_version()
+        if _catalog is not None and (version is None or version == _content_version):
+            return False
+        reload_content_catalog()
+        return True
+
+def start_catalog_refresher(interval: float = 60) -> threading.Thread:
+    """Run refresh_content_catalog() every interval seconds on a daemon thread"""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return _refresher
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                refresh_content_catalog()
+            except Exception as e:
+                logger.warning(f"Content catalog refresh failed: {e}")
+
+    _refresher = threading.Thread(target=run, name='content-catalog-refresher', daemon=True)
+    _refresher.start()
+    return _refresher
@@ -4,8 +4,9 @@ Handles skill type classification, content organization, and analytics
 """
 
 from typing import Dict, List, Any, Optional
-from .models import Question, Lesson, Level, StudentAttempt
-from .database import query
+from .models import StudentAttempt
+from .content_catalog import content_catalog, QUESTION_TYPES
+from .content_statistics import content_statistics
 
 class ContentCategorization:
     """Main class for content categorization and skill analytics"""
@@ -63,16 +64,10 @@ class ContentCategorization:
     @classmethod
     def content_overview(cls) -> Dict[str, Any]:
         """Get overview of all content by categories"""
-        # Get question statistics by type
-        question_stats = Question.type_statistics()
-        
-        # Get difficulty distribution
-        difficulty_stats = Question.difficulty_statistics()
-        
-        # Get total counts
-        total_questions = sum(question_stats.values())
-        total_lessons = len(Lesson.all())
-        total_levels = len(Level.all())
+        statistics = content_statistics()
+        question_stats = statistics.question_types
+        difficulty_stats = dict(statistics.difficulty_levels)
+        total_questions = statistics.total_questions
         
         # Build category overview
         categories_overview = {}
@@ -86,8 +81,8 @@ class ContentCategorization:
         
         return {
             'total_questions': total_questions,
-            'total_lessons': total_lessons,
-            'total_levels': total_levels,
+            'total_lessons': statistics.total_lessons,
+            'total_levels': statistics.total_levels,
             'categories': categories_overview,
             'difficulty_distribution': difficulty_stats
         }
@@ -95,11 +90,12 @@ class ContentCategorization:
     @classmethod
     def lessons_by_skill(cls, skill_type: str, level_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get lessons that focus on a specific skill"""
-        lessons = Lesson.by_skill_focus(skill_type, level_id)
+        catalog = content_catalog()
+        lessons = catalog.lessons_by_skill_focus(skill_type, level_id)
         
         result = []
         for lesson in lessons:
-            skill_breakdown = lesson.skill_categories()
+            skill_breakdown = catalog.skill_categories(lesson.lesson_id)
             result.append({
                 'lesson_id': lesson.lesson_id,
                 'lesson_name': lesson.lesson_name,
@@ -109,7 +105,7 @@ class ContentCategorization:
                 'estimated_time_minutes': lesson.estimated_time_minutes,
                 'skill_breakdown': skill_breakdown,
                 'primary_skill': skill_type,
-                'question_count': lesson.question_count()
+                'question_count': catalog.question_count(lesson.lesson_id)
             })
         
         return result
@@ -202,19 +198,19 @@ class ContentCategorization:
     @classmethod
     def level_skill_distribution(cls, level_id: int) -> Dict[str, Any]:
         """Get skill type distribution for a specific level"""
-        sql = """
-        SELECT 
-            q.question_type,
-            COUNT(*) as question_count,
-            l.lesson_name,
-            l.lesson_id
-        FROM questions q
-        JOIN lessons l ON q.lesson_id = l.lesson_id
-        WHERE l.level_id = %s
-        GROUP BY q.question_type, l.lesson_id, l.lesson_name
-        ORDER BY l.lesson_order, q.question_type
-        """
-        results = query(sql, (level_id,))
+        # Per-lesson counts by skill type, ordered like the grouped SQL they replace
+        catalog = content_catalog()
+        results = [
+            {
+                'question_type': question_type,
+                'question_count': count,
+                'lesson_name': lesson.lesson_name,
+                'lesson_id': lesson.lesson_id
+            }
+            for lesson in catalog.lessons_for_level(level_id)
+            for question_type, count in sorted(catalog.skill_categories(lesson.lesson_id).items(),
+                                               key=lambda item: QUESTION_TYPES.index(item[0]))
+        ]
         
         # Organize by skill type
         skill_distribution = {}
@@ -0,0 +1,53 @@
+"""
+Content Statistics module for WORDIAMO English Learning Platform
+Question type, difficulty and content totals computed once per catalog version
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+from .content_catalog import ContentCatalog, content_catalog
+
+DIFFICULTY_ORDER = ('easy', 'medium', 'hard')
+
+class ContentStatistics:
+    """Read-only content counts for one catalog version"""
+
+    def __init__(self, catalog: ContentCatalog):
+        self.version = catalog.version
+        self.total_questions = len(catalog.questions)
+        self.total_lessons = len(catalog.lessons)
+        self.total_levels = len(catalog.levels)
+
+        # Most common type first, as the old GROUP BY ... ORDER BY count DESC did
+        self.question_types: Mapping[str, int] = MappingProxyType(dict(sorted(
+            ((question_type, len(questions)) for question_type, questions in catalog.questions_by_type.items()),
+            key=lambda item: item[1], reverse=True
+        )))
+        self.difficulty_levels: Mapping[str, int] = MappingProxyType({
+            difficulty: len(catalog.questions_by_difficulty[difficulty])
+            for difficulty in DIFFICULTY_ORDER if difficulty in catalog.questions_by_difficulty
+        })
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the statistics in the /content/statistics shape"""
+        return {
+            'question_types': dict(self.question_types),
+            'difficulty_levels': dict(self.difficulty_levels),
+            'total_questions': self.total_questions
+        }
+
+_statistics: Optional[ContentStatistics] = None
+_lock = threading.Lock()
+
+def content_statistics() -> ContentStatistics:
+    """Get statistics for the current catalog, recomputing only when its version changes"""
+    global _statistics
+    catalog = content_catalog()
+    statistics = _statistics
+    if statistics is None or statistics.version != catalog.version:
+        with _lock:
+            if _statistics is None or _statistics.version != catalog.version:
+                _statistics = ContentStatistics(catalog)
+            statistics = _statistics
+    return statistics
@@ -1,5 +1,16 @@
 """Database module for WORDIAMO"""
 
-from .database import DatabaseManager, db_manager_instance, query, insert, update
+from .database import (
+    DatabaseManager, db_manager_instance, init_request_scope, transaction,
+    pool_metrics, cache_stats, invalidate_cache, query, iter_query, query_in, insert, update,
+    insert_many
+)
+from .pool import DatabaseSaturatedError
+from .profiling import init_query_budgets, query_budget_stats, QueryBudgetExceeded
 
-__all__ = ['DatabaseManager', 'db_manager_instance', 'query', 'insert', 'update']
\ No newline at end of file
+__all__ = [
+    'DatabaseManager', 'db_manager_instance', 'init_request_scope', 'transaction',
+    'pool_metrics', 'cache_stats', 'invalidate_cache', 'query', 'iter_query', 'query_in', 'insert', 'update',
+    'insert_many',
+    'DatabaseSaturatedError', 'init_query_budgets', 'query_budget_stats', 'QueryBudgetExceeded'
+]
@@ -0,0 +1,128 @@
+"""
+Query result cache for WORDIAMO
+LRU cache of SELECT results keyed by SQL and params, tagged by the tables
+each statement reads and invalidated when a write touches one of them
+"""
+
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet
+
+# Tables whose SELECTs may be cached; everything else always hits MySQL
+DEFAULT_CACHEABLE_TABLES = ('levels', 'lessons', 'questions', 'options')
+
+_READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+`?(\w+)`?', re.IGNORECASE)
+_WRITE_TABLES = re.compile(
+    r'^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE\s+(?:TABLE\s+)?)\s*`?(\w+)`?',
+    re.IGNORECASE
+)
+
+def read_tables(sql: str) -> FrozenSet[str]:
+    """Get the tables a SELECT statement reads"""
+    return frozenset(table.lower() for table in _READ_TABLES.findall(sql))
+
+def written_table(sql: str) -> Optional[str]:
+    """Get the table an INSERT/UPDATE/DELETE statement writes, if recognised"""
+    match = _WRITE_TABLES.match(sql)
+    return match.group(1).lower() if match else None
+
+class QueryCache:
+    """Thread-safe LRU cache of query results with TTLs and table tags"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300,
+                 cacheable_tables: Tuple[str, ...] = DEFAULT_CACHEABLE_TABLES):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cacheable_tables = frozenset(cacheable_tables)
+        self._entries: 'OrderedDict[Tuple, Tuple[float, FrozenSet[str], Any]]' = OrderedDict()
+        self._tables_by_sql: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def tables_for(self, sql: str) -> Optional[FrozenSet[str]]:
+        """Get the tag set for a statement, or None if it must not be cached"""
+        if sql not in self._tables_by_sql:
+            tables = read_tables(sql)
+            cacheable = bool(tables) and tables <= self.cacheable_tables
+            self._tables_by_sql[sql] = tables if cacheable else None
+        return self._tables_by_sql[sql]
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Look up a result; returns (found, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: Tuple, tables: FrozenSet[str], value: Any, ttl_seconds: Optional[float] = None):
+        """Store a result tagged with the tables it was read from"""
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, tables, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_table(self, table: str) -> int:
+        """Drop every entry tagged with table; returns the number dropped"""
+        with self._lock:
+            stale = [key for key, (_, tables, _) in self._entries.items() if table in tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+def cache_from_env() -> Optional[QueryCache]:
+    """Build the query cache from DB_QUERY_CACHE* settings, or None when disabled"""
+    if os.getenv('DB_QUERY_CACHE', 'False').lower() != 'true':
+        return None
+    tables = os.getenv('DB_QUERY_CACHE_TABLES')
+    return QueryCache(
+        max_entries=int(os.getenv('DB_QUERY_CACHE_SIZE', 1024)),
+        ttl_seconds=float(os.getenv('DB_QUERY_CACHE_TTL', 300)),
+        cacheable_tables=tuple(t.strip() for t in tables.split(',')) if tables else DEFAULT_CACHEABLE_TABLES
+    )
+
+def copy_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy cached rows so callers can't mutate the shared entry"""
+    return [dict(row) for row in rows]
@@ -0,0 +1,20 @@
+"""
+Request context helpers for the database layer
+Exposes Flask's g to the database layer without making Flask a hard requirement
+"""
+
+from typing import Any, Optional
+
+try:
+    from flask import g, has_app_context
+except ImportError:  # Database layer used outside the web app (scripts, setup)
+    g = None
+
+    def has_app_context() -> bool:
+        return False
+
+def request_state() -> Optional[Any]:
+    """Get the per-request state object (Flask's g), or None outside a request"""
+    if g is not None and has_app_context():
+        return g
+    return None
@@ -1,15 +1,21 @@
 """
 Database connection module for WORDIAMO
-Handles MySQL connections with pooling
+Handles MySQL connections with pooling and read-replica routing
 """
 
 import mysql.connector
-from mysql.connector import pooling, Error
+from mysql.connector import Error, InterfaceError, OperationalError
 import os
-from typing import Optional, Dict, List, Any, Tuple
+import threading
+import time
+from typing import Optional, Dict, List, Any, Tuple, Sequence, Iterator, Callable
 import logging
 from contextlib import contextmanager
 from dotenv import load_dotenv
+from .context import request_state
+from .pool import ConnectionPool, DatabaseSaturatedError, caller_name
+from .profiling import profile_statement
+from .cache import QueryCache, cache_from_env, copy_rows, written_table
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,13 +23,42 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on placeholders per IN (...) list; larger key lists are chunked
+IN_CHUNK_SIZE = 500
+
+# Rows fetched per round trip when streaming large result sets
+ITER_BATCH_SIZE = 500
+
+# Builds a per-statement row converter from the result's column names; the
+# converter receives plain positional tuples instead of per-row dicts
+RowFactory = Callable[[Tuple[str, ...]], Callable[[tuple], Any]]
+
 class DatabaseManager:
-    """Database manager with connection pooling"""
+    """Database manager with connection pooling
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    Writes always go to the primary. Reads go round-robin to healthy
+    replicas when any are configured, and fall back to the primary when a
+    replica fails, inside a transaction, or after the current request (or,
+    outside a request, the current thread within the last few seconds) has
+    written, so callers always read their own writes.
+    """
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 replicas: Optional[List[Dict[str, Any]]] = None,
+                 cache: Optional[QueryCache] = None):
         self.config = config or self._default_config()
+        self.cache = cache if cache is not None else cache_from_env()
+        self.replica_configs = replicas if replicas is not None else self._default_replicas()
+        self.replica_retry_seconds = float(os.getenv('DB_REPLICA_RETRY_SECONDS', 30))
+        self.replica_pin_seconds = float(os.getenv('DB_REPLICA_PIN_SECONDS', 5))
         self.pool = None
+        self.replica_pools = []
+        self._replica_down_until = {}
+        self._replica_cursor = 0
+        self._replica_lock = threading.Lock()
+        self._local = threading.local()
         self._create_connection_pool()
+        self._create_replica_pools()
     
     def _default_config(self) -> Dict[str, Any]:
         """Get default database configuration"""
@@ -37,25 +72,107 @@ class DatabaseManager:
             'use_unicode': True,
             'autocommit': True,
             'pool_name': 'wordiamo_pool',
-            'pool_size': 10,
-            'pool_reset_session': True
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+            'pool_reset_session': True,
+            'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+            'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', 5)),
+            'max_waiters': int(os.getenv('DB_POOL_MAX_WAITERS', 50)),
+            'retry_after': int(os.getenv('DB_POOL_RETRY_AFTER', 1))
         }
     
+    def _default_replicas(self) -> List[Dict[str, Any]]:
+        """Build replica configs from DB_REPLICA_HOSTS (comma separated host[:port])"""
+        replicas = []
+        hosts = [h.strip() for h in os.getenv('DB_REPLICA_HOSTS', '').split(',') if h.strip()]
+        for index, host in enumerate(hosts):
+            name, _, port = host.partition(':')
+            replicas.append({
+                **self.config,
+                'host': name,
+                'port': int(port) if port else self.config['port'],
+                'pool_name': f"{self.config['pool_name']}_replica_{index}"
+            })
+        return replicas
+    
     def _create_connection_pool(self):
         """Create MySQL connection pool"""
         try:
-            self.pool = pooling.MySQLConnectionPool(**self.config)
+            self.pool = ConnectionPool(**self.config)
             logger.info("Database connection pool created successfully")
         except Error as e:
             logger.error(f"Error creating connection pool: {e}")
             raise
     
+    def _create_replica_pools(self):
+        """Create one pool per replica; an unreachable replica is skipped, not fatal"""
+        for replica_config in self.replica_configs:
+            try:
+                self.replica_pools.append(ConnectionPool(**replica_config))
+                logger.info(f"Replica pool {replica_config['pool_name']} created successfully")
+            except Error as e:
+                logger.error(f"Error creating replica pool {replica_config['pool_name']}: {e}")
+    
+    def _read_pool(self) -> ConnectionPool:
+        """Pick the pool for a read: next healthy replica, else the primary"""
+        if not self.replica_pools or self._pinned_to_primary():
+            return self.pool
+        
+        now = time.monotonic()
+        with self._replica_lock:
+            for _ in range(len(self.replica_pools)):
+                replica = self.replica_pools[self._replica_cursor % len(self.replica_pools)]
+                self._replica_cursor += 1
+                if self._replica_down_until.get(replica.pool_name, 0) <= now:
+                    return replica
+        return self.pool
+    
+    def _mark_replica_down(self, pool: ConnectionPool, error: Exception):
+        """Take a failing replica out of rotation for replica_retry_seconds"""
+        logger.warning(f"Replica {pool.pool_name} unavailable, routing reads to primary: {error}")
+        with self._replica_lock:
+            self._replica_down_until[pool.pool_name] = time.monotonic() + self.replica_retry_seconds
+    
+    def _pin_primary(self):
+        """Route later reads to the primary so they see the write just made"""
+        if not self.replica_pools:
+            return
+        state = request_state()
+        if state is not None:
+            state.db_pin_primary = True
+        else:
+            self._local.pinned_until = time.monotonic() + self.replica_pin_seconds
+    
+    def _pinned_to_primary(self) -> bool:
+        """Check if reads must stay on the primary"""
+        if self.in_transaction():
+            return True
+        state = request_state()
+        if state is not None:
+            return bool(state.get('db_pin_primary'))
+        return getattr(self._local, 'pinned_until', 0) > time.monotonic()
+    
     @contextmanager
-    def connection(self):
-        """Context manager for database connections"""
+    def connection(self, pool: Optional[ConnectionPool] = None):
+        """Context manager for database connections
+        
+        Yields the open transaction's connection, or the request-scoped
+        connection for the pool when one is bound, before falling back to a
+        fresh checkout. Defaults to the primary pool.
+        """
+        pool = pool or self.pool
+        bound = self._bound_connection(pool)
+        if bound is not None:
+            try:
+                yield bound
+            except (InterfaceError, OperationalError):
+                # Don't keep handing a broken connection to the rest of the request
+                self._discard_bound_connection(pool)
+                raise
+            return
+        
         connection = None
         try:
-            connection = self.pool.get_connection()
+            connection = pool.get_connection()
             yield connection
         except Error as e:
             logger.error(f"Database connection error: {e}")
@@ -63,53 +180,329 @@ class DatabaseManager:
                 connection.rollback()
             raise
         finally:
-            if connection and connection.is_connected():
+            # Always hand the connection back, even if it dropped, so the pool
+            # and its overflow accounting never leak a slot
+            if connection:
+                try:
+                    connection.close()
+                except Error as e:
+                    logger.error(f"Error returning connection to pool: {e}")
+    
+    def _bound_connection(self, pool: ConnectionPool):
+        """Get the connection bound to the current transaction or request, if any"""
+        transaction_connection = getattr(self._local, 'transaction', None)
+        if transaction_connection is not None:
+            return transaction_connection
+        
+        state = request_state()
+        if state is None or not state.get('db_request_scope'):
+            return None
+        
+        # Acquire lazily so requests that never touch the database cost nothing
+        connections = state.setdefault('db_connections', {})
+        connection = connections.get(id(pool))
+        if connection is None:
+            connection = pool.get_connection()
+            connections[id(pool)] = connection
+        return connection
+    
+    def _discard_bound_connection(self, pool: ConnectionPool):
+        """Drop and release a broken request-scoped connection"""
+        state = request_state()
+        connection = state.get('db_connections', {}).pop(id(pool), None) if state is not None else None
+        if connection is not None:
+            try:
                 connection.close()
+            except Error as e:
+                logger.error(f"Error returning connection to pool: {e}")
     
-    def execute_query(self, query: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
-        """Execute SELECT query and return results"""
+    def in_transaction(self) -> bool:
+        """Check if the current thread has an open transaction"""
+        return getattr(self._local, 'transaction', None) is not None
+    
+    @contextmanager
+    def transaction(self):
+        """Group several statements into one transaction on a single connection
+        
+        Commits on success and rolls back on any exception. Nested calls join
+        the outer transaction.
+        """
+        if self.in_transaction():
+            yield self._local.transaction
+            return
+        
         with self.connection() as connection:
-            cursor = connection.cursor(dictionary=True)
+            connection.start_transaction()
+            self._local.transaction = connection
+            self._local.written_tables = set()
             try:
+                yield connection
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                self._local.transaction = None
+                # Readers may have re-cached old rows while the transaction was open
+                for table in self._local.written_tables:
+                    self._invalidate_table(table)
+    
+    def _run_read(self, work, primary: bool = False):
+        """Run work(connection) on a read connection, failing over to the primary"""
+        pool = self.pool if primary else self._read_pool()
+        self._record_query(pool)
+        try:
+            with self.connection(pool) as connection:
+                return work(connection)
+        except (InterfaceError, OperationalError, DatabaseSaturatedError) as e:
+            if pool is self.pool:
+                raise
+            if not isinstance(e, DatabaseSaturatedError):
+                self._mark_replica_down(pool, e)
+            with self.connection(self.pool) as connection:
+                return work(connection)
+    
+    def _cached(self, key: Tuple, query: str, load, copy=copy_rows, bypass: bool = False):
+        """Serve a read from the query cache, loading and storing it on a miss"""
+        tables = self.cache.tables_for(query) if self.cache is not None and not bypass else None
+        if tables is None or self.in_transaction():
+            return load()
+        
+        found, rows = self.cache.get(key)
+        if not found:
+            rows = load()
+            self.cache.put(key, tables, rows)
+        return copy(rows) if copy else rows
+    
+    def _invalidate_written(self, query: str):
+        """Drop cached results for the table a write statement touched"""
+        table = written_table(query)
+        if table is None:
+            return
+        self._invalidate_table(table)
+        if self.in_transaction():
+            self._local.written_tables.add(table)
+    
+    def _invalidate_table(self, table: str):
+        """Drop cached results tagged with table"""
+        if self.cache is not None:
+            self.cache.invalidate_table(table)
+    
+    def execute_query(self, query: str, params: Optional[Tuple] = None,
+                      row_factory: Optional[RowFactory] = None, primary: bool = False) -> List[Any]:
+        """Execute SELECT query and return results
+        
+        Rows are dicts by default. With a row_factory the cursor returns plain
+        tuples and each one is converted by the callable the factory builds
+        once from the statement's column names, skipping the per-row dict.
+        primary=True reads from the primary and skips the query cache, for
+        reads that must see the latest committed write.
+        """
+        params_key = tuple(params or ())
+        if row_factory is None:
+            return self._cached(('query', query, params_key), query,
+                                lambda: self._execute_query(query, params, True, primary), bypass=primary)
+        
+        columns, rows = self._cached(('query_tuples', query, params_key), query,
+                                     lambda: self._execute_query(query, params, False, primary),
+                                     copy=None, bypass=primary)
+        build = row_factory(columns)
+        return [build(row) for row in rows]
+    
+    def _execute_query(self, query: str, params: Optional[Tuple], dictionary: bool, primary: bool = False):
+        def fetch(connection):
+            cursor = connection.cursor(dictionary=dictionary)
+            try:
+                with profile_statement(connection, query, params):
+                    cursor.execute(query, params or ())
+                    results = cursor.fetchall()
+                return results if dictionary else (tuple(cursor.column_names), results)
+            except Error as e:
+                logger.error(f"Error executing query: {e}")
+                raise
+            finally:
+                cursor.close()
+        
+        return self._run_read(fetch, primary)
+    
+    def iter_query(self, query: str, params: Optional[Tuple] = None,
+                   batch_size: int = ITER_BATCH_SIZE,
+                   row_factory: Optional[RowFactory] = None) -> Iterator[Any]:
+        """Execute SELECT query and stream rows without materializing the result
+        
+        Uses an unbuffered cursor on its own pooled connection and pulls rows in
+        fetchmany batches, so memory stays flat regardless of result size. The
+        connection is held until the generator is exhausted or closed; it does
+        not see writes from an open transaction on another connection. Rows
+        are dicts unless a row_factory is given (see execute_query).
+        """
+        pool = self._read_pool()
+        self._record_query(pool)
+        connection = pool.get_connection()
+        cursor = connection.cursor(dictionary=row_factory is None, buffered=False)
+        try:
+            # Only the execute is timed; the stream is paced by the consumer.
+            # No EXPLAIN: the connection is busy until the stream is read
+            with profile_statement(connection, query, params, explain=False):
                 cursor.execute(query, params or ())
-                results = cursor.fetchall()
-                return results
+            build = row_factory(tuple(cursor.column_names)) if row_factory else None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if build is None:
+                    yield from rows
+                else:
+                    for row in rows:
+                        yield build(row)
+        except Error as e:
+            logger.error(f"Error executing query: {e}")
+            raise
+        finally:
+            # Drain anything left unread so the connection can be reused
+            try:
+                connection.consume_results()
+                cursor.close()
+            finally:
+                connection.close()
+    
+    def execute_query_in(self, query: str, keys: Sequence[Any], params: Optional[Tuple] = None,
+                         chunk_size: int = IN_CHUNK_SIZE,
+                         row_factory: Optional[RowFactory] = None) -> List[Any]:
+        """Execute SELECT query with an IN (...) list expanded from keys.
+
+        The query must contain a single ``{keys}`` marker where the placeholder
+        list belongs, e.g. ``SELECT * FROM options WHERE question_id IN ({keys})``.
+        Extra params are bound before the keys. Duplicate keys are dropped and
+        long key lists are split into chunks that share one connection.
+        Rows are dicts unless a row_factory is given (see execute_query).
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return []
+        
+        keys_key = (tuple(unique_keys), tuple(params or ()))
+        if row_factory is None:
+            return self._cached(('query_in', query) + keys_key, query,
+                                lambda: self._execute_query_in(query, unique_keys, params, chunk_size, True))
+        
+        columns, rows = self._cached(('query_in_tuples', query) + keys_key, query,
+                                     lambda: self._execute_query_in(query, unique_keys, params, chunk_size, False),
+                                     copy=None)
+        build = row_factory(columns)
+        return [build(row) for row in rows]
+    
+    def _execute_query_in(self, query: str, unique_keys: List[Any], params: Optional[Tuple],
+                          chunk_size: int, dictionary: bool):
+        def fetch(connection):
+            results = []
+            cursor = connection.cursor(dictionary=dictionary)
+            try:
+                for start in range(0, len(unique_keys), chunk_size):
+                    chunk = unique_keys[start:start + chunk_size]
+                    chunk_query = query.format(keys=', '.join(['%s'] * len(chunk)))
+                    chunk_params = tuple(params or ()) + tuple(chunk)
+                    with profile_statement(connection, chunk_query, chunk_params):
+                        cursor.execute(chunk_query, chunk_params)
+                        results.extend(cursor.fetchall())
+                return results if dictionary else (tuple(cursor.column_names), results)
             except Error as e:
                 logger.error(f"Error executing query: {e}")
                 raise
             finally:
                 cursor.close()
+        
+        return self._run_read(fetch)
     
     def execute_insert(self, query: str, params: Optional[Tuple] = None) -> int:
         """Execute INSERT query and return last inserted ID"""
+        self._record_query(self.pool)
         with self.connection() as connection:
             cursor = connection.cursor()
             try:
-                cursor.execute(query, params or ())
-                connection.commit()
+                with profile_statement(connection, query, params):
+                    cursor.execute(query, params or ())
+                if not self.in_transaction():
+                    connection.commit()
+                self._pin_primary()
+                self._invalidate_written(query)
                 return cursor.lastrowid
             except Error as e:
                 logger.error(f"Error executing insert: {e}")
-                connection.rollback()
+                if not self.in_transaction():
+                    connection.rollback()
                 raise
             finally:
                 cursor.close()
     
     def execute_update(self, query: str, params: Optional[Tuple] = None) -> int:
         """Execute UPDATE/DELETE query and return affected rows"""
+        self._record_query(self.pool)
         with self.connection() as connection:
             cursor = connection.cursor()
             try:
-                cursor.execute(query, params or ())
-                connection.commit()
+                with profile_statement(connection, query, params):
+                    cursor.execute(query, params or ())
+                if not self.in_transaction():
+                    connection.commit()
+                self._pin_primary()
+                self._invalidate_written(query)
                 return cursor.rowcount
             except Error as e:
                 logger.error(f"Error executing update: {e}")
-                connection.rollback()
+                if not self.in_transaction():
+                    connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def execute_many(self, query: str, rows: Sequence[Tuple]) -> int:
+        """Execute one INSERT for many parameter rows and return affected rows
+        
+        mysql-connector rewrites INSERT ... VALUES executemany() calls into a
+        single multi-row statement, so this is one round trip.
+        """
+        if not rows:
+            return 0
+        self._record_query(self.pool)
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                with profile_statement(connection, query, rows[0]):
+                    cursor.executemany(query, rows)
+                if not self.in_transaction():
+                    connection.commit()
+                self._pin_primary()
+                self._invalidate_written(query)
+                return cursor.rowcount
+            except Error as e:
+                logger.error(f"Error executing batch insert: {e}")
+                if not self.in_transaction():
+                    connection.rollback()
                 raise
             finally:
                 cursor.close()
     
+    def _record_query(self, pool: ConnectionPool):
+        """Attribute a statement to the first caller outside the database layer"""
+        pool.metrics.record_query(caller_name(__package__))
+    
+    def pool_stats(self) -> List[Dict[str, Any]]:
+        """Get metrics snapshots for every pool this manager owns"""
+        now = time.monotonic()
+        stats = [{**self.pool.metrics.snapshot(), 'role': 'primary', 'healthy': True}]
+        for replica in self.replica_pools:
+            stats.append({
+                **replica.metrics.snapshot(),
+                'role': 'replica',
+                'healthy': self._replica_down_until.get(replica.pool_name, 0) <= now
+            })
+        return stats
+    
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get query cache counters, or None when caching is disabled"""
+        return self.cache.stats() if self.cache is not None else None
+    
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
@@ -133,9 +526,62 @@ def db_manager_instance() -> DatabaseManager:
         db_manager = DatabaseManager()
     return db_manager
 
-def query(sql: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
-    """Execute SELECT query"""
-    return db_manager_instance().execute_query(sql, params)
+def init_request_scope(app):
+    """Opt a Flask app into one pooled connection per request
+    
+    The connection is checked out on the request's first query and returned
+    to the pool in teardown, so a request pays for a single checkout and
+    session reset no matter how many helpers it calls.
+    """
+    from flask import g
+    
+    @app.before_request
+    def bind_request_connection():
+        g.db_request_scope = True
+    
+    @app.teardown_appcontext
+    def release_request_connection(exception=None):
+        connections = g.pop('db_connections', {})
+        for connection in connections.values():
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+                connection.close()
+            except Error as e:
+                logger.error(f"Error releasing request connection: {e}")
+
+def pool_metrics() -> List[Dict[str, Any]]:
+    """Get connection pool metrics for the global database manager"""
+    return db_manager_instance().pool_stats()
+
+def cache_stats() -> Optional[Dict[str, Any]]:
+    """Get query cache counters for the global database manager"""
+    return db_manager_instance().cache_stats()
+
+def invalidate_cache(*tables: str):
+    """Drop cached query results for the given tables"""
+    manager = db_manager_instance()
+    for table in tables:
+        manager._invalidate_table(table)
+
+def transaction():
+    """Run the enclosed query/insert/update calls in a single transaction"""
+    return db_manager_instance().transaction()
+
+def query(sql: str, params: Optional[Tuple] = None,
+          row_factory: Optional[RowFactory] = None, primary: bool = False) -> List[Any]:
+    """Execute SELECT query (on the primary, uncached, when primary is True)"""
+    return db_manager_instance().execute_query(sql, params, row_factory=row_factory, primary=primary)
+
+def iter_query(sql: str, params: Optional[Tuple] = None,
+               row_factory: Optional[RowFactory] = None) -> Iterator[Any]:
+    """Stream SELECT query rows in batches"""
+    return db_manager_instance().iter_query(sql, params, row_factory=row_factory)
+
+def query_in(sql: str, keys: Sequence[Any], params: Optional[Tuple] = None,
+             row_factory: Optional[RowFactory] = None) -> List[Any]:
+    """Execute SELECT query for a list of keys (see DatabaseManager.execute_query_in)"""
+    return db_manager_instance().execute_query_in(sql, keys, params, row_factory=row_factory)
 
 def insert(sql: str, params: Optional[Tuple] = None) -> int:
     """Execute INSERT query"""
@@ -143,4 +589,8 @@ def insert(sql: str, params: Optional[Tuple] = None) -> int:
 
 def update(sql: str, params: Optional[Tuple] = None) -> int:
     """Execute UPDATE/DELETE query"""
-    return db_manager_instance().execute_update(sql, params)
\ No newline at end of file
+    return db_manager_instance().execute_update(sql, params)
+
+def insert_many(sql: str, rows: Sequence[Tuple]) -> int:
+    """Execute a multi-row INSERT"""
+    return db_manager_instance().execute_many(sql, rows)
@@ -0,0 +1,299 @@
+"""
+Connection pool wrapper for WORDIAMO
+Adds checkout/hold timing, in-use tracking, per-caller query counts,
+bounded waiting, overflow connections and load shedding on top of
+mysql-connector's MySQLConnectionPool
+"""
+
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Tuple
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Config keys understood by MySQLConnectionPool but not by a plain connect()
+POOL_ONLY_KEYS = ('pool_name', 'pool_size', 'pool_reset_session')
+
+class DatabaseSaturatedError(PoolError):
+    """Raised when no connection frees up within the pool's wait budget"""
+    
+    def __init__(self, msg: str, retry_after: int = 1):
+        super().__init__(msg=msg)
+        self.retry_after = retry_after
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram of durations in seconds"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record a single observation"""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a consistent copy of the histogram state"""
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), self.counts):
+                cumulative += bucket_count
+                buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+            return {
+                'count': self.count,
+                'sum': round(self.total, 6),
+                'max': round(self.max, 6),
+                'avg': round(self.total / self.count, 6) if self.count else 0.0,
+                'buckets': buckets
+            }
+
+class PoolMetrics:
+    """Counters and histograms for a single connection pool"""
+
+    def __init__(self, pool_name: str, pool_size: int, max_overflow: int = 0):
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.exhausted = 0
+        self.overflow_opened = 0
+        self.overflow_in_use = 0
+        self.waiting = 0
+        self.shed = 0
+        self.checkout_wait = Histogram()
+        self.hold_time = Histogram()
+        self.queries_by_caller: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_seconds: float, overflow: bool = False):
+        """Record a successful checkout"""
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            if self.in_use > self.peak_in_use:
+                self.peak_in_use = self.in_use
+            if overflow:
+                self.overflow_opened += 1
+                self.overflow_in_use += 1
+        self.checkout_wait.observe(wait_seconds)
+
+    def record_release(self, hold_seconds: float, overflow: bool = False):
+        """Record a connection returned to the pool"""
+        with self._lock:
+            self.in_use -= 1
+            if overflow:
+                self.overflow_in_use -= 1
+        self.hold_time.observe(hold_seconds)
+
+    def record_waiting(self, delta: int):
+        """Adjust the number of threads queued for a connection"""
+        with self._lock:
+            self.waiting += delta
+
+    def record_shed(self):
+        """Record a checkout rejected because the pool stayed saturated"""
+        with self._lock:
+            self.shed += 1
+
+    def record_exhausted(self):
+        """Record a checkout that found the pool exhausted"""
+        with self._lock:
+            self.exhausted += 1
+
+    def record_query(self, caller: str):
+        """Record a statement issued by caller"""
+        with self._lock:
+            self.queries_by_caller[caller] = self.queries_by_caller.get(caller, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current pool metrics as a plain dict"""
+        with self._lock:
+            counters = {
+                'pool_name': self.pool_name,
+                'pool_size': self.pool_size,
+                'checkouts': self.checkouts,
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'exhausted': self.exhausted,
+                'max_overflow': self.max_overflow,
+                'overflow_opened': self.overflow_opened,
+                'overflow_in_use': self.overflow_in_use,
+                'waiting': self.waiting,
+                'shed': self.shed,
+                'queries_by_caller': dict(sorted(self.queries_by_caller.items(),
+                                                 key=lambda item: item[1], reverse=True))
+            }
+        counters['checkout_wait_seconds'] = self.checkout_wait.snapshot()
+        counters['hold_seconds'] = self.hold_time.snapshot()
+        return counters
+
+class TrackedConnection:
+    """Pooled connection proxy that reports hold time when returned"""
+
+    def __init__(self, connection, pool: 'ConnectionPool', overflow: bool = False):
+        self._connection = connection
+        self._pool = pool
+        self._overflow = overflow
+        self._acquired_at = time.perf_counter()
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self._released:
+            return
+        self._released = True
+        try:
+            self._connection.close()
+        finally:
+            self._pool.release(self._overflow, time.perf_counter() - self._acquired_at)
+
+class ConnectionPool:
+    """MySQLConnectionPool with instrumentation, bounded waiting and overflow
+    
+    When every pooled connection is busy a checkout first opens a temporary
+    overflow connection (up to max_overflow), then queues for up to
+    pool_timeout seconds behind at most max_waiters other threads. Anything
+    beyond that is shed with DatabaseSaturatedError instead of piling up.
+    """
+
+    def __init__(self, pool_timeout: float = 5.0, max_overflow: int = 0,
+                 max_waiters: int = 50, retry_after: int = 1, **config):
+        self._pool = pooling.MySQLConnectionPool(**config)
+        self._connect_config = {k: v for k, v in config.items() if k not in POOL_ONLY_KEYS}
+        self.pool_name = self._pool.pool_name
+        self.pool_size = self._pool.pool_size
+        self.pool_timeout = pool_timeout
+        self.max_overflow = max_overflow
+        self.max_waiters = max_waiters
+        self.retry_after = retry_after
+        self.metrics = PoolMetrics(self.pool_name, self.pool_size, max_overflow)
+        self._available = threading.Condition()
+        self._overflow = 0
+        self._waiters = 0
+        self._releases = 0
+
+    def get_connection(self) -> TrackedConnection:
+        """Check out a connection, waiting or overflowing when the pool is busy"""
+        started = time.perf_counter()
+        deadline = started + self.pool_timeout
+        exhausted = False
+        
+        while True:
+            releases_seen = self._releases
+            try:
+                connection = self._pool.get_connection()
+                self.metrics.record_checkout(time.perf_counter() - started)
+                return TrackedConnection(connection, self)
+            except PoolError:
+                if not exhausted:
+                    exhausted = True
+                    self.metrics.record_exhausted()
+            
+            with self._available:
+                if self._overflow < self.max_overflow:
+                    self._overflow += 1
+                    break
+                
+                # A connection came back while we were trying; retry at once
+                if self._releases != releases_seen:
+                    continue
+                
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or self._waiters >= self.max_waiters:
+                    self.metrics.record_shed()
+                    raise DatabaseSaturatedError(
+                        f"Database pool '{self.pool_name}' saturated", self.retry_after
+                    )
+                
+                self._waiters += 1
+                self.metrics.record_waiting(1)
+                try:
+                    self._available.wait(remaining)
+                finally:
+                    self._waiters -= 1
+                    self.metrics.record_waiting(-1)
+        
+        # Overflow slot reserved; open the connection outside the lock
+        try:
+            connection = mysql.connector.connect(**self._connect_config)
+        except Exception:
+            with self._available:
+                self._overflow -= 1
+                self._available.notify()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, overflow=True)
+        return TrackedConnection(connection, self, overflow=True)
+
+    def release(self, overflow: bool, hold_seconds: float):
+        """Account for a returned connection and wake one waiter"""
+        with self._available:
+            if overflow:
+                self._overflow -= 1
+            self._releases += 1
+            self._available.notify()
+        self.metrics.record_release(hold_seconds, overflow)
+
+def caller_name(skip_package: str) -> str:
+    """Name the first function on the stack outside skip_package"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(skip_package) and module != 'contextlib':
+            code = frame.f_code
+            return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return 'unknown'
+
+def to_prometheus(snapshots: List[Dict[str, Any]]) -> str:
+    """Render pool snapshots in the Prometheus text exposition format"""
+    lines = []
+
+    def histogram(name: str, label: str, data: Dict[str, Any]):
+        """Append bucket, sum and count lines for one histogram"""
+        for bound, count in data['buckets'].items():
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+        lines.append(f'{name}_sum{{{label}}} {data["sum"]}')
+        lines.append(f'{name}_count{{{label}}} {data["count"]}')
+
+    for snapshot in snapshots:
+        label = f'pool="{snapshot["pool_name"]}"'
+        lines.append(f'wordiamo_db_pool_size{{{label}}} {snapshot["pool_size"]}')
+        lines.append(f'wordiamo_db_pool_in_use{{{label}}} {snapshot["in_use"]}')
+        lines.append(f'wordiamo_db_pool_peak_in_use{{{label}}} {snapshot["peak_in_use"]}')
+        lines.append(f'wordiamo_db_pool_checkouts_total{{{label}}} {snapshot["checkouts"]}')
+        lines.append(f'wordiamo_db_pool_exhausted_total{{{label}}} {snapshot["exhausted"]}')
+        lines.append(f'wordiamo_db_pool_overflow_in_use{{{label}}} {snapshot["overflow_in_use"]}')
+        lines.append(f'wordiamo_db_pool_overflow_opened_total{{{label}}} {snapshot["overflow_opened"]}')
+        lines.append(f'wordiamo_db_pool_waiting{{{label}}} {snapshot["waiting"]}')
+        lines.append(f'wordiamo_db_pool_shed_total{{{label}}} {snapshot["shed"]}')
+        histogram('wordiamo_db_pool_checkout_wait_seconds', label, snapshot['checkout_wait_seconds'])
+        histogram('wordiamo_db_pool_hold_seconds', label, snapshot['hold_seconds'])
+        for caller, count in snapshot['queries_by_caller'].items():
+            lines.append(f'wordiamo_db_queries_total{{{label},caller="{caller}"}} {count}')
+
+    return '\n'.join(lines) + '\n'
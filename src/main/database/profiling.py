@@ -0,0 +1,125 @@
+"""
+Query profiling for WORDIAMO
+Slow query logging with EXPLAIN capture and per-endpoint query budgets
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+from .context import request_state
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged with their EXPLAIN plan
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 200))
+EXPLAIN_SLOW_QUERIES = os.getenv('DB_EXPLAIN_SLOW_QUERIES', 'True').lower() == 'true'
+
+# Default number of statements a single request may issue before warning
+DEFAULT_QUERY_BUDGET = int(os.getenv('DB_QUERY_BUDGET', 20))
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request issues more statements than its budget"""
+
+class EndpointQueryStats:
+    """Per-endpoint request and statement counters"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, query_count: int, over_budget: bool):
+        """Record the statement count of one finished request"""
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'over_budget': 0
+            })
+            stats['requests'] += 1
+            stats['queries'] += query_count
+            stats['max_queries'] = max(stats['max_queries'], query_count)
+            if over_budget:
+                stats['over_budget'] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-endpoint counters with average statements per request"""
+        with self._lock:
+            return {
+                endpoint: {
+                    **stats,
+                    'avg_queries': round(stats['queries'] / stats['requests'], 2) if stats['requests'] else 0
+                }
+                for endpoint, stats in self._stats.items()
+            }
+
+endpoint_stats = EndpointQueryStats()
+
+@contextmanager
+def profile_statement(connection, sql: str, params: Optional[Tuple] = None, explain: bool = True):
+    """Time one statement, count it against the request and log it if slow
+
+    The EXPLAIN runs on the same connection after the statement's results
+    have been read, so it sees the same session and transaction. Pass
+    explain=False for unbuffered cursors: their rows are still unread when
+    the block exits, and the connection cannot run another statement.
+    """
+    started = time.perf_counter()
+    yield
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    state = request_state()
+    if state is not None:
+        state.db_query_count = state.get('db_query_count', 0) + 1
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        log_slow_query(connection, sql, params, elapsed_ms, explain)
+
+def log_slow_query(connection, sql: str, params: Optional[Tuple], elapsed_ms: float, explain: bool = True):
+    """Log a slow statement, with its EXPLAIN plan for SELECTs unless explain is False"""
+    statement = ' '.join(sql.split())
+    plan = None
+    if explain and EXPLAIN_SLOW_QUERIES and statement.upper().startswith('SELECT'):
+        try:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(f"EXPLAIN {sql}", params or ())
+                plan = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+
+    logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {statement} params={params} plan={plan}")
+
+def init_query_budgets(app):
+    """Check each request's statement count against its endpoint budget
+
+    Budgets come from app.config['QUERY_BUDGETS'] (endpoint -> max statements)
+    with app.config['QUERY_BUDGET_DEFAULT'] as the fallback. Over-budget
+    requests are logged, or fail with QueryBudgetExceeded when
+    app.config['QUERY_BUDGET_STRICT'] is set (defaults to app.testing).
+    """
+    from flask import g, request
+
+    app.config.setdefault('QUERY_BUDGETS', {})
+    app.config.setdefault('QUERY_BUDGET_DEFAULT', DEFAULT_QUERY_BUDGET)
+
+    @app.after_request
+    def check_query_budget(response):
+        endpoint = request.endpoint or request.path
+        query_count = g.get('db_query_count', 0)
+        budget = app.config['QUERY_BUDGETS'].get(endpoint, app.config['QUERY_BUDGET_DEFAULT'])
+        over_budget = query_count > budget
+        endpoint_stats.record(endpoint, query_count, over_budget)
+
+        if over_budget:
+            message = f"{endpoint} issued {query_count} queries (budget {budget})"
+            if app.config.get('QUERY_BUDGET_STRICT', app.testing):
+                raise QueryBudgetExceeded(message)
+            logger.warning(f"Query budget exceeded: {message}")
+        return response
+
+def query_budget_stats() -> Dict[str, Dict[str, Any]]:
+    """Get per-endpoint statement counts"""
+    return endpoint_stats.snapshot()
@@ -4,11 +4,76 @@ Contains all entity classes and their methods
 """
 
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from ..database import query, insert, update
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Callable
+from ..database import query, iter_query, query_in, insert, insert_many, update, transaction
+from ..database.context import request_state
+
+def model_rows(cls) -> Callable[[Tuple[str, ...]], Callable[[tuple], Any]]:
+    """Row factory that builds cls instances straight from positional tuples
+    
+    The column-to-argument mapping is worked out once per statement from the
+    result's column names and cls._fields (the constructor's parameter
+    order). Columns the model doesn't know are ignored.
+    """
+    def factory(columns: Tuple[str, ...]) -> Callable[[tuple], Any]:
+        present = [field for field in cls._fields if field in columns]
+        indexes = [columns.index(field) for field in present]
+        
+        if not present:
+            return lambda row: cls()
+        if present == list(cls._fields[:len(present)]):
+            # Known columns cover a prefix of the constructor: pass positionally
+            if indexes == list(range(len(columns))):
+                return lambda row: cls(*row)
+            if len(indexes) == 1:
+                index = indexes[0]
+                return lambda row: cls(row[index])
+            getter = itemgetter(*indexes)
+            return lambda row: cls(*getter(row))
+        
+        pairs = list(zip(present, indexes))
+        return lambda row: cls(**{field: row[index] for field, index in pairs})
+    
+    return factory
+
+def _identity_map(cls) -> Optional[Dict[Any, Any]]:
+    """Get the current request's loaded instances of cls, or None outside a request"""
+    state = request_state()
+    if state is None:
+        return None
+    maps = state.get('identity_map')
+    if maps is None:
+        maps = state.identity_map = {}
+    return maps.setdefault(cls, {})
+
+def _load_by_id(cls, key: Any, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+    """Return the instance already loaded for key in this request, or load and remember it"""
+    identity_map = _identity_map(cls)
+    if identity_map is None:
+        return load()
+    instance = identity_map.get(key)
+    if instance is None:
+        instance = load()
+        if instance is not None:
+            identity_map[key] = instance
+    return instance
+
+def forget_instance(cls, key: Any):
+    """Drop cls's instance for key from the request identity map"""
+    identity_map = _identity_map(cls)
+    if identity_map is not None:
+        identity_map.pop(key, None)
 
 class User:
-    """User model for student accounts"""
+    """User model for student accounts
+
+    Models declare __slots__ from _fields so instances carry no per-object
+    __dict__; attributes stay the same as the table columns.
+    """
+    
+    _fields = ('user_id', 'username', 'email', 'password_hash', 'current_level_id', 'created_at', 'updated_at')
+    __slots__ = _fields
     
     def __init__(self, user_id: int = None, username: str = None, email: str = None, 
                  password_hash: str = None, current_level_id: int = 1, 
@@ -38,7 +103,12 @@ class User:
     
     @classmethod
     def by_id(cls, user_id: int) -> Optional['User']:
-        """Get user by ID"""
+        """Get user by ID, reusing the instance already loaded in this request"""
+        return _load_by_id(cls, user_id, lambda: cls._fetch(user_id))
+    
+    @classmethod
+    def _fetch(cls, user_id: int) -> Optional['User']:
+        """Load user by ID from the database"""
         sql = "SELECT * FROM users WHERE user_id = %s"
         result = query(sql, (user_id,))
         if result:
@@ -84,8 +154,19 @@ class User:
         params.append(self.user_id)
         
         affected = update(sql, tuple(params))
+        forget_instance(User, self.user_id)
         return affected > 0
     
+    def change_password(self, password_hash: str) -> bool:
+        """Replace the user's password hash"""
+        sql = "UPDATE users SET password_hash = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s"
+        affected = update(sql, (password_hash, self.user_id))
+        forget_instance(User, self.user_id)
+        if affected > 0:
+            self.password_hash = password_hash
+            return True
+        return False
+    
     def attempts(self) -> List[Dict[str, Any]]:
         """Get all quiz attempts for this user"""
         sql = """
@@ -102,24 +183,25 @@ class User:
         """Get user's learning progress"""
         sql = """
         SELECT 
-            COUNT(DISTINCT sa.lesson_id) as completed_lessons,
-            AVG(sa.score) as average_score,
-            MAX(sa.attempt_date) as last_activity,
+            COUNT(ulp.lesson_id) as completed_lessons,
+            SUM(ulp.passed_score_total) / SUM(ulp.passed_attempts) as average_score,
+            MAX(ulp.last_passed_at) as last_activity,
             l.level_name as current_level
-        FROM student_attempts sa
-        JOIN lessons ls ON sa.lesson_id = ls.lesson_id
-        JOIN levels l ON %s = l.level_id
-        WHERE sa.user_id = %s AND sa.score >= 70
+        FROM levels l
+        LEFT JOIN user_lesson_progress ulp
+            ON ulp.user_id = %s AND ulp.first_passed_at IS NOT NULL
+        WHERE l.level_id = %s
+        GROUP BY l.level_id, l.level_name
         """
-        result = query(sql, (self.current_level_id, self.user_id))
+        result = query(sql, (self.user_id, self.current_level_id))
         return result[0] if result else {}
     
     def completed_lessons(self) -> List[int]:
         """Get list of completed lesson IDs (lessons with passing score >= 70%)"""
         sql = """
-        SELECT DISTINCT lesson_id 
-        FROM student_attempts 
-        WHERE user_id = %s AND score >= 70
+        SELECT lesson_id 
+        FROM user_lesson_progress 
+        WHERE user_id = %s AND first_passed_at IS NOT NULL
         """
         result = query(sql, (self.user_id,))
         return [row['lesson_id'] for row in result] if result else []
@@ -127,12 +209,12 @@ class User:
     def is_lesson_completed(self, lesson_id: int) -> bool:
         """Check if a specific lesson is completed"""
         sql = """
-        SELECT COUNT(*) as count
-        FROM student_attempts 
-        WHERE user_id = %s AND lesson_id = %s AND score >= 70
+        SELECT first_passed_at
+        FROM user_lesson_progress 
+        WHERE user_id = %s AND lesson_id = %s
         """
         result = query(sql, (self.user_id, lesson_id))
-        return result[0]['count'] > 0 if result else False
+        return bool(result) and result[0]['first_passed_at'] is not None
     
     def level_completion_progress(self, level_id: int) -> Dict[str, Any]:
         """Get completion progress for a specific level"""
@@ -147,10 +229,10 @@ class User:
         
         # Get completed lessons in level
         sql_completed = """
-        SELECT COUNT(DISTINCT l.lesson_id) as completed_lessons
+        SELECT COUNT(*) as completed_lessons
         FROM lessons l
-        JOIN student_attempts sa ON l.lesson_id = sa.lesson_id
-        WHERE l.level_id = %s AND sa.user_id = %s AND sa.score >= 70
+        JOIN user_lesson_progress ulp ON l.lesson_id = ulp.lesson_id
+        WHERE l.level_id = %s AND ulp.user_id = %s AND ulp.first_passed_at IS NOT NULL
         """
         completed_result = query(sql_completed, (level_id, self.user_id))
         completed_lessons = completed_result[0]['completed_lessons'] if completed_result else 0
@@ -193,6 +275,78 @@ class User:
             'current_progress': current_progress
         }
     
+    def progress_snapshot(self) -> Dict[str, Any]:
+        """Get progress, completed lessons, per-level completion and upgrade eligibility
+        
+        Returns the same shapes as progress(), completed_lessons(),
+        level_completion_progress() and check_level_upgrade() using two
+        grouped queries over user_lesson_progress, however many levels there are.
+        """
+        # Passed lessons; the ROLLUP row (lesson_id NULL) holds the overall figures
+        sql_passed = """
+        SELECT lesson_id,
+               SUM(passed_score_total) / SUM(passed_attempts) as average_score,
+               MAX(last_passed_at) as last_activity
+        FROM user_lesson_progress
+        WHERE user_id = %s AND first_passed_at IS NOT NULL
+        GROUP BY lesson_id WITH ROLLUP
+        """
+        passed = query(sql_passed, (self.user_id,))
+        completed_lessons = [row['lesson_id'] for row in passed if row['lesson_id'] is not None]
+        overall = next((row for row in passed if row['lesson_id'] is None), {})
+        
+        sql_levels = """
+        SELECT lv.level_id, lv.level_name, lv.level_order,
+               COUNT(ls.lesson_id) as total_lessons,
+               COUNT(done.lesson_id) as completed_lessons
+        FROM levels lv
+        LEFT JOIN lessons ls ON ls.level_id = lv.level_id
+        LEFT JOIN user_lesson_progress done
+            ON done.lesson_id = ls.lesson_id AND done.user_id = %s AND done.first_passed_at IS NOT NULL
+        GROUP BY lv.level_id, lv.level_name, lv.level_order
+        ORDER BY lv.level_order
+        """
+        levels = query(sql_levels, (self.user_id,))
+        
+        level_progress = {}
+        for row in levels:
+            total, completed = row['total_lessons'], row['completed_lessons']
+            level_progress[row['level_id']] = {
+                'total_lessons': total,
+                'completed_lessons': completed,
+                'completion_percentage': round((completed / total * 100) if total > 0 else 0, 1),
+                'is_level_completed': completed == total and total > 0
+            }
+        
+        current = next((row for row in levels if row['level_id'] == self.current_level_id), None)
+        current_progress = level_progress.get(self.current_level_id, {
+            'total_lessons': 0, 'completed_lessons': 0,
+            'completion_percentage': 0, 'is_level_completed': False
+        })
+        
+        level_upgrade = {'can_upgrade': False, 'current_progress': current_progress}
+        if current and current_progress['is_level_completed']:
+            next_level = next((row for row in levels if row['level_order'] > current['level_order']), None)
+            if next_level:
+                level_upgrade = {
+                    'can_upgrade': True,
+                    'next_level_id': next_level['level_id'],
+                    'next_level_name': next_level['level_name'],
+                    'current_progress': current_progress
+                }
+        
+        return {
+            'progress': {
+                'completed_lessons': len(completed_lessons),
+                'average_score': overall.get('average_score'),
+                'last_activity': overall.get('last_activity'),
+                'current_level': current['level_name'] if current else None
+            },
+            'completed_lessons': completed_lessons,
+            'level_progress': level_progress,
+            'level_upgrade': level_upgrade
+        }
+    
     def upgrade_level(self) -> bool:
         """Upgrade user to next level if eligible"""
         upgrade_check = self.check_level_upgrade()
@@ -200,6 +354,7 @@ class User:
         if upgrade_check['can_upgrade']:
             sql = "UPDATE users SET current_level_id = %s WHERE user_id = %s"
             affected = update(sql, (upgrade_check['next_level_id'], self.user_id))
+            forget_instance(User, self.user_id)
             
             if affected > 0:
                 self.current_level_id = upgrade_check['next_level_id']
@@ -210,6 +365,9 @@ class User:
 class Level:
     """Level model for learning levels"""
     
+    _fields = ('level_id', 'level_name', 'level_description', 'level_order', 'created_at')
+    __slots__ = _fields
+    
     def __init__(self, level_id: int = None, level_name: str = None, 
                  level_description: str = None, level_order: int = None, 
                  created_at: datetime = None):
@@ -228,7 +386,12 @@ class Level:
     
     @classmethod
     def by_id(cls, level_id: int) -> Optional['Level']:
-        """Get level by ID"""
+        """Get level by ID, reusing the instance already loaded in this request"""
+        return _load_by_id(cls, level_id, lambda: cls._fetch(level_id))
+    
+    @classmethod
+    def _fetch(cls, level_id: int) -> Optional['Level']:
+        """Load level by ID from the database"""
         sql = "SELECT * FROM levels WHERE level_id = %s"
         result = query(sql, (level_id,))
         if result:
@@ -248,6 +411,10 @@ class Level:
 class Lesson:
     """Lesson model for individual lessons"""
     
+    _fields = ('lesson_id', 'lesson_name', 'lesson_description', 'level_id', 'lesson_order',
+               'estimated_time_minutes', 'created_at')
+    __slots__ = _fields
+    
     def __init__(self, lesson_id: int = None, lesson_name: str = None, 
                  lesson_description: str = None, level_id: int = None, 
                  lesson_order: int = None, estimated_time_minutes: int = 15, 
@@ -276,7 +443,12 @@ class Lesson:
     
     @classmethod
     def by_id(cls, lesson_id: int) -> Optional['Lesson']:
-        """Get lesson by ID"""
+        """Get lesson by ID, reusing the instance already loaded in this request"""
+        return _load_by_id(cls, lesson_id, lambda: cls._fetch(lesson_id))
+    
+    @classmethod
+    def _fetch(cls, lesson_id: int) -> Optional['Lesson']:
+        """Load lesson by ID from the database"""
         sql = "SELECT * FROM lessons WHERE lesson_id = %s"
         result = query(sql, (lesson_id,))
         if result:
@@ -295,9 +467,25 @@ class Lesson:
     
     def average_score(self) -> float:
         """Get average score for this lesson"""
-        sql = "SELECT AVG(score) as avg_score FROM student_attempts WHERE lesson_id = %s"
-        result = query(sql, (self.lesson_id,))
-        return result[0]['avg_score'] if result and result[0]['avg_score'] else 0.0
+        return Lesson.stats_for([self.lesson_id]).get(self.lesson_id, {}).get('average_score', 0.0)
+    
+    @staticmethod
+    def stats_for(lesson_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get precomputed question count, attempt count and average score per lesson"""
+        sql = """
+        SELECT lesson_id, question_count, attempt_count, score_total
+        FROM lesson_stats
+        WHERE lesson_id IN ({keys})
+        """
+        stats = {}
+        for row in query_in(sql, lesson_ids):
+            attempts = row['attempt_count']
+            stats[row['lesson_id']] = {
+                'question_count': row['question_count'],
+                'attempt_count': attempts,
+                'average_score': float(row['score_total']) / attempts if attempts else 0.0
+            }
+        return stats
     
     def skill_categories(self) -> Dict[str, int]:
         """Get count of questions by skill type for this lesson"""
@@ -334,6 +522,9 @@ class Lesson:
 class Question:
     """Question model for quiz questions"""
     
+    _fields = ('question_id', 'question_text', 'lesson_id', 'question_type', 'difficulty_level', 'created_at')
+    __slots__ = _fields
+    
     def __init__(self, question_id: int = None, question_text: str = None, 
                  lesson_id: int = None, question_type: str = 'vocabulary', 
                  difficulty_level: str = 'easy', created_at: datetime = None):
@@ -348,8 +539,7 @@ class Question:
     def by_lesson(cls, lesson_id: int) -> List['Question']:
         """Get all questions for a specific lesson"""
         sql = "SELECT * FROM questions WHERE lesson_id = %s ORDER BY question_id"
-        results = query(sql, (lesson_id,))
-        return [cls(**row) for row in results]
+        return query(sql, (lesson_id,), row_factory=model_rows(cls))
     
     @classmethod
     def by_id(cls, question_id: int) -> Optional['Question']:
@@ -360,6 +550,13 @@ class Question:
             return cls(**result[0])
         return None
     
+    @classmethod
+    def by_ids(cls, question_ids: List[int]) -> Dict[int, 'Question']:
+        """Get questions for a list of IDs in one query, keyed by question ID"""
+        sql = "SELECT * FROM questions WHERE question_id IN ({keys}) ORDER BY question_id"
+        results = query_in(sql, question_ids, row_factory=model_rows(cls))
+        return {question.question_id: question for question in results}
+    
     def options(self) -> List['Option']:
         """Get all options for this question"""
         return Option.by_question(self.question_id)
@@ -379,9 +576,32 @@ class Question:
     @classmethod
     def by_type(cls, question_type: str) -> List['Question']:
         """Get all questions by type"""
+        return list(cls.iter_by_type(question_type))
+    
+    @classmethod
+    def iter_by_type(cls, question_type: str) -> Iterator['Question']:
+        """Stream questions of a type without loading the whole result"""
         sql = "SELECT * FROM questions WHERE question_type = %s ORDER BY lesson_id, question_id"
-        results = query(sql, (question_type,))
-        return [cls(**row) for row in results]
+        yield from iter_query(sql, (question_type,), row_factory=model_rows(cls))
+    
+    @staticmethod
+    def with_options(questions: Iterable['Question'],
+                     batch_size: int = 500) -> Iterator[Tuple['Question', List['Option']]]:
+        """Pair questions with their options, loading options one batch at a time"""
+        batch = []
+        for question in questions:
+            batch.append(question)
+            if len(batch) >= batch_size:
+                yield from Question._pair_options(batch)
+                batch = []
+        if batch:
+            yield from Question._pair_options(batch)
+    
+    @staticmethod
+    def _pair_options(questions: List['Question']) -> Iterator[Tuple['Question', List['Option']]]:
+        options_by_question = Option.by_questions([q.question_id for q in questions])
+        for question in questions:
+            yield question, options_by_question[question.question_id]
     
     @classmethod
     def type_statistics(cls) -> Dict[str, int]:
@@ -410,6 +630,9 @@ class Question:
 class Option:
     """Option model for question choices"""
     
+    _fields = ('option_id', 'question_id', 'option_text', 'is_correct', 'option_order')
+    __slots__ = _fields
+    
     def __init__(self, option_id: int = None, question_id: int = None, 
                  option_text: str = None, is_correct: bool = False, 
                  option_order: int = None):
@@ -426,6 +649,15 @@ class Option:
         results = query(sql, (question_id,))
         return [cls(**row) for row in results]
     
+    @classmethod
+    def by_questions(cls, question_ids: List[int]) -> Dict[int, List['Option']]:
+        """Get options for several questions in one query, grouped by question ID"""
+        grouped = {question_id: [] for question_id in question_ids}
+        sql = "SELECT * FROM options WHERE question_id IN ({keys}) ORDER BY question_id, option_order"
+        for option in query_in(sql, question_ids, row_factory=model_rows(cls)):
+            grouped.setdefault(option.question_id, []).append(option)
+        return grouped
+    
     @classmethod
     def by_id(cls, option_id: int) -> Optional['Option']:
         """Get option by ID"""
@@ -438,6 +670,10 @@ class Option:
 class StudentAttempt:
     """Student attempt model for quiz results"""
     
+    _fields = ('attempt_id', 'user_id', 'lesson_id', 'score', 'total_questions', 'correct_answers',
+               'attempt_date', 'completion_time_minutes', 'is_completed')
+    __slots__ = _fields
+    
     def __init__(self, attempt_id: int = None, user_id: int = None, 
                  lesson_id: int = None, score: int = 0, total_questions: int = 0, 
                  correct_answers: int = 0, attempt_date: datetime = None, 
@@ -456,15 +692,49 @@ class StudentAttempt:
     def create(cls, user_id: int, lesson_id: int, score: int, 
                total_questions: int, correct_answers: int, 
                completion_time_minutes: int = None, is_completed: bool = False) -> 'StudentAttempt':
-        """Create a new student attempt"""
+        """Create a new student attempt and update the user's lesson progress"""
         sql = """
         INSERT INTO student_attempts 
         (user_id, lesson_id, score, total_questions, correct_answers, completion_time_minutes, is_completed)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        attempt_id = insert(sql, (user_id, lesson_id, score, total_questions, 
-                                correct_answers, completion_time_minutes, is_completed))
-        return cls.by_id(attempt_id)
+        with transaction():
+            attempt_id = insert(sql, (user_id, lesson_id, score, total_questions, 
+                                    correct_answers, completion_time_minutes, is_completed))
+            attempt = cls.by_id(attempt_id)
+            cls._record_progress(attempt)
+        return attempt
+    
+    @staticmethod
+    def _record_progress(attempt: 'StudentAttempt'):
+        """Fold one attempt into user_lesson_progress and lesson_stats"""
+        passed = attempt.score >= 70
+        sql = """
+        INSERT INTO user_lesson_progress
+        (user_id, lesson_id, best_score, attempt_count, passed_attempts, passed_score_total,
+         first_passed_at, last_passed_at, last_attempt_at)
+        VALUES (%s, %s, %s, 1, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            best_score = GREATEST(best_score, VALUES(best_score)),
+            attempt_count = attempt_count + 1,
+            passed_attempts = passed_attempts + VALUES(passed_attempts),
+            passed_score_total = passed_score_total + VALUES(passed_score_total),
+            first_passed_at = COALESCE(first_passed_at, VALUES(first_passed_at)),
+            last_passed_at = COALESCE(VALUES(last_passed_at), last_passed_at),
+            last_attempt_at = VALUES(last_attempt_at)
+        """
+        passed_at = attempt.attempt_date if passed else None
+        update(sql, (attempt.user_id, attempt.lesson_id, attempt.score,
+                     int(passed), attempt.score if passed else 0,
+                     passed_at, passed_at, attempt.attempt_date))
+        
+        sql_stats = """
+        INSERT INTO lesson_stats (lesson_id, attempt_count, score_total) VALUES (%s, 1, %s)
+        ON DUPLICATE KEY UPDATE
+            attempt_count = attempt_count + 1,
+            score_total = score_total + VALUES(score_total)
+        """
+        update(sql_stats, (attempt.lesson_id, attempt.score))
     
     @classmethod
     def by_id(cls, attempt_id: int) -> Optional['StudentAttempt']:
@@ -478,9 +748,45 @@ class StudentAttempt:
     @classmethod
     def by_user(cls, user_id: int) -> List['StudentAttempt']:
         """Get all attempts by a specific user"""
+        return list(cls.iter_by_user(user_id))
+    
+    @classmethod
+    def iter_by_user(cls, user_id: int, limit: Optional[int] = None) -> Iterator['StudentAttempt']:
+        """Stream a user's attempts, newest first, optionally capped at limit"""
         sql = "SELECT * FROM student_attempts WHERE user_id = %s ORDER BY attempt_date DESC"
-        results = query(sql, (user_id,))
-        return [cls(**row) for row in results]
+        params = (user_id,)
+        if limit is not None:
+            sql += " LIMIT %s"
+            params = (user_id, limit)
+        yield from iter_query(sql, params, row_factory=model_rows(cls))
+    
+    @classmethod
+    def history_page(cls, user_id: int, limit: int,
+                     before: Optional[Tuple[datetime, int]] = None) -> List[Tuple['StudentAttempt', str]]:
+        """Get up to limit (attempt, lesson_name) pairs, newest first
+        
+        Keyset pagination: pass the (attempt_date, attempt_id) of the last
+        attempt of the previous page as before to get the next page.
+        """
+        sql = """
+        SELECT sa.*, l.lesson_name
+        FROM student_attempts sa
+        JOIN lessons l ON sa.lesson_id = l.lesson_id
+        WHERE sa.user_id = %s
+        """
+        params: Tuple = (user_id,)
+        if before is not None:
+            sql += " AND (sa.attempt_date < %s OR (sa.attempt_date = %s AND sa.attempt_id < %s))"
+            params += (before[0], before[0], before[1])
+        sql += " ORDER BY sa.attempt_date DESC, sa.attempt_id DESC LIMIT %s"
+        params += (limit,)
+        
+        def with_lesson_name(columns: Tuple[str, ...]) -> Callable[[tuple], Tuple['StudentAttempt', str]]:
+            build = model_rows(cls)(columns)
+            name_index = columns.index('lesson_name')
+            return lambda row: (build(row), row[name_index])
+        
+        return query(sql, params, row_factory=with_lesson_name)
     
     def calculate_percentage(self) -> float:
         """Calculate percentage score"""
@@ -492,47 +798,75 @@ class StudentAttempt:
         """Check if score meets passing threshold"""
         return self.calculate_percentage() >= passing_threshold
     
+    def record_answers(self, answers: List[Tuple[int, str, Optional[int], bool]]):
+        """Persist (question_id, question_type, selected_option_id, is_correct) answers
+        
+        Writes every answer with one multi-row insert and folds the per-skill
+        counts into user_skill_performance, in the caller's transaction.
+        """
+        if not answers:
+            return
+        
+        with transaction():
+            insert_many(
+                "INSERT INTO user_answers (attempt_id, question_id, selected_option_id, is_correct) "
+                "VALUES (%s, %s, %s, %s)",
+                [(self.attempt_id, question_id, option_id, is_correct)
+                 for question_id, _, option_id, is_correct in answers]
+            )
+            
+            # The progress row was just upserted; a count of 1 means this lesson is new to the user
+            progress = query(
+                "SELECT attempt_count FROM user_lesson_progress WHERE user_id = %s AND lesson_id = %s",
+                (self.user_id, self.lesson_id)
+            )
+            first_attempt = int(not progress or progress[0]['attempt_count'] <= 1)
+            
+            by_skill: Dict[str, List[int]] = {}
+            for _, question_type, _, is_correct in answers:
+                counts = by_skill.setdefault(question_type, [0, 0])
+                counts[0] += 1
+                counts[1] += int(bool(is_correct))
+            
+            insert_many(
+                """
+                INSERT INTO user_skill_performance
+                (user_id, question_type, questions_attempted, correct_answers, attempts, score_total, lessons_attempted)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    questions_attempted = questions_attempted + VALUES(questions_attempted),
+                    correct_answers = correct_answers + VALUES(correct_answers),
+                    attempts = attempts + VALUES(attempts),
+                    score_total = score_total + VALUES(score_total),
+                    lessons_attempted = lessons_attempted + VALUES(lessons_attempted)
+                """,
+                [(self.user_id, question_type, attempted, correct, 1, self.score, first_attempt)
+                 for question_type, (attempted, correct) in by_skill.items()]
+            )
+    
     @classmethod
     def performance_by_skill(cls, user_id: int) -> Dict[str, Dict[str, Any]]:
         """Get user performance breakdown by skill type"""
         sql = """
-        SELECT 
-            q.question_type,
-            COUNT(*) as total_questions,
-            SUM(CASE 
-                WHEN o.is_correct = TRUE 
-                AND EXISTS (
-                    SELECT 1 FROM options correct_opt 
-                    WHERE correct_opt.question_id = q.question_id 
-                    AND correct_opt.is_correct = TRUE
-                    AND correct_opt.option_id = ua.selected_option_id
-                ) 
-                THEN 1 ELSE 0 
-            END) as correct_answers,
-            AVG(sa.score) as avg_score,
-            COUNT(DISTINCT sa.lesson_id) as lessons_attempted
-        FROM student_attempts sa
-        JOIN lessons l ON sa.lesson_id = l.lesson_id
-        JOIN questions q ON l.lesson_id = q.lesson_id
-        LEFT JOIN user_answers ua ON sa.attempt_id = ua.attempt_id AND q.question_id = ua.question_id
-        LEFT JOIN options o ON ua.selected_option_id = o.option_id
-        WHERE sa.user_id = %s
-        GROUP BY q.question_type
+        SELECT question_type, questions_attempted, correct_answers, attempts, score_total, lessons_attempted
+        FROM user_skill_performance
+        WHERE user_id = %s
         """
         results = query(sql, (user_id,))
         
         performance = {}
         for row in results:
             skill_type = row['question_type']
-            total = row['total_questions'] or 0
+            total = row['questions_attempted'] or 0
             correct = row['correct_answers'] or 0
+            attempts = row['attempts'] or 0
             
             performance[skill_type] = {
                 'total_questions': total,
                 'correct_answers': correct,
                 'accuracy_percentage': (correct / total * 100) if total > 0 else 0,
-                'average_score': row['avg_score'] or 0,
+                'average_score': (row['score_total'] / attempts) if attempts > 0 else 0,
                 'lessons_attempted': row['lessons_attempted'] or 0
             }
         
-        return performance
\ No newline at end of file
+        return performance